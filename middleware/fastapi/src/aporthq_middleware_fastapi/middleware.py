@@ -4,13 +4,18 @@ Supports all API combinations: agent_id (cloud), passport in body (local),
 policy in body (pack_id IN_BODY). Delegates to aporthq_sdk_python.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
+import logging
 import os
-from typing import Callable, Optional, List, Dict, Any, Union
+import time
+from typing import Awaitable, Callable, Hashable, Optional, List, Dict, Any, Tuple, Union
+import orjson
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from aporthq_sdk_python import (
     APortClient,
@@ -21,6 +26,19 @@ from aporthq_sdk_python import (
 )
 
 
+logger = logging.getLogger("aporthq.middleware.fastapi")
+
+# orjson options for response bodies; tolerate non-str keys like stdlib json does
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTS)
+
+
 class AgentRequest(Request):
     """Extended FastAPI Request type to include agent and policy data."""
     agent: Optional[Dict[str, Any]] = None
@@ -30,6 +48,21 @@ class AgentRequest(Request):
 class AgentPassportMiddlewareOptions:
     """Configuration options for the Agent Passport middleware."""
 
+    __slots__ = (
+        "base_url",
+        "api_key",
+        "timeout_ms",
+        "fail_closed",
+        "_skip_paths",
+        "_skip_paths_tuple",
+        "_skip_exact",
+        "policy_id",
+        "passport_from_body",
+        "policy_from_body",
+        "cache_ttl_seconds",
+        "coalesce_inflight",
+    )
+
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -40,6 +73,8 @@ class AgentPassportMiddlewareOptions:
         policy_id: Optional[str] = None,
         passport_from_body: bool = True,
         policy_from_body: bool = True,
+        cache_ttl_seconds: float = 0.0,
+        coalesce_inflight: bool = False,
     ):
         self.base_url = base_url or os.getenv("AGENT_PASSPORT_BASE_URL", "https://api.aport.io")
         self.api_key = api_key or os.getenv("AGENT_PASSPORT_API_KEY")
@@ -49,10 +84,28 @@ class AgentPassportMiddlewareOptions:
         self.policy_id = policy_id
         self.passport_from_body = passport_from_body
         self.policy_from_body = policy_from_body
+        # Cache passport views and allow decisions for this long (0 disables)
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # Share one verify_policy call among identical concurrent requests
+        self.coalesce_inflight = coalesce_inflight
+
+    @property
+    def skip_paths(self) -> List[str]:
+        """Path prefixes that bypass verification."""
+        return self._skip_paths
+
+    @skip_paths.setter
+    def skip_paths(self, value: List[str]) -> None:
+        # Precompute the lookups used by should_skip_request on every request
+        self._skip_paths = list(value)
+        self._skip_paths_tuple = tuple(self._skip_paths)
+        self._skip_exact = frozenset(p for p in self._skip_paths if "/" not in p[1:])
 
 
 class PolicyMiddlewareOptions:
     """Options for policy-specific middleware."""
+
+    __slots__ = ("policy_id", "agent_id", "context")
     
     def __init__(
         self,
@@ -74,7 +127,11 @@ def create_client(
     api_key: Optional[str] = None,
     timeout_ms: Optional[int] = None,
 ) -> APortClient:
-    """Create APortClient with sensible defaults."""
+    """Create APortClient with sensible defaults.
+
+    Not cached: the client's HTTP session is bound to the event loop it first runs on,
+    so each middleware instance owns its client rather than sharing one across apps/loops.
+    """
     options = APortClientOptions(
         base_url=base_url or os.getenv("AGENT_PASSPORT_BASE_URL", "https://api.aport.io"),
         api_key=api_key or os.getenv("AGENT_PASSPORT_API_KEY"),
@@ -83,6 +140,56 @@ def create_client(
     return APortClient(options)
 
 
+# Shared env-configured client for the route helpers and direct SDK functions,
+# so they reuse one HTTP session (keep-alive, TLS) instead of one per call. One per
+# running event loop: a client's session is bound to the loop it was created on.
+_DEFAULT_CLIENTS: Dict[asyncio.AbstractEventLoop, Tuple[APortClient, PolicyVerifier]] = {}
+
+
+def _get_default(loop: asyncio.AbstractEventLoop) -> Tuple[APortClient, PolicyVerifier]:
+    """Return the running loop's shared client and verifier, creating them on first use."""
+    default = _DEFAULT_CLIENTS.get(loop)
+    if default is None:
+        # Drop clients of loops that have since closed (a finished asyncio.run, a restarted worker)
+        for stale in [other for other in _DEFAULT_CLIENTS if other.is_closed()]:
+            del _DEFAULT_CLIENTS[stale]
+        client = create_client()
+        default = _DEFAULT_CLIENTS[loop] = (client, PolicyVerifier(client))
+    return default
+
+
+def _get_default_client() -> APortClient:
+    """Return the shared client for the running event loop."""
+    return _get_default(asyncio.get_running_loop())[0]
+
+
+def _get_default_verifier() -> PolicyVerifier:
+    """Return the PolicyVerifier bound to the running loop's shared client."""
+    return _get_default(asyncio.get_running_loop())[1]
+
+
+# Agent ID headers as raw ASGI names (already lowercased per the spec)
+_H_PASSPORT = b"x-agent-passport-id"
+_H_AGENT = b"x-agent-id"
+
+
+def _header_agent_id(scope: Scope) -> Optional[str]:
+    """X-Agent-Passport-Id, else X-Agent-Id, in one pass over the raw scope headers."""
+    fallback: Optional[bytes] = None
+    for name, value in scope["headers"]:
+        if name == _H_PASSPORT and value:
+            return value.decode("latin-1")
+        if name == _H_AGENT and value and fallback is None:
+            fallback = value
+    return fallback.decode("latin-1") if fallback is not None else None
+
+
+def _dict_field(body_json: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """body_json[key] if it is a JSON object, else None (one lookup, one type check)."""
+    value = body_json.get(key)
+    return value if isinstance(value, dict) else None
+
+
 def extract_agent_id(
     request: Request,
     provided_agent_id: Optional[str] = None,
@@ -92,56 +199,238 @@ def extract_agent_id(
     """Extract agent ID from parameter, headers, or body.passport.agent_id."""
     if provided_agent_id:
         return provided_agent_id
-    if passport_from_body and body_json and isinstance(body_json.get("passport"), dict):
-        aid = body_json["passport"].get("agent_id")
-        if aid:
-            return aid
-    return (
-        request.headers.get("x-agent-passport-id")
-        or request.headers.get("x-agent-id")
-        or None
-    )
+    body_passport = _dict_field(body_json, "passport") if passport_from_body and body_json else None
+    return (body_passport.get("agent_id") if body_passport else None) or _header_agent_id(request.scope)
 
 
-async def _read_and_replay_body(request: Request) -> Dict[str, Any]:
-    """Read request body, parse JSON, and replace scope['receive'] so the route can read it again."""
-    body_bytes = await request.body()
+# Scope keys under which the request body is cached once read
+_SCOPE_BODY_BYTES = "_aport_body_bytes"
+_SCOPE_BODY_JSON = "_aport_body_json"
+
+
+def _parse_body_json(body_bytes: bytes) -> Dict[str, Any]:
+    """Parse a JSON request body; anything else yields an empty dict."""
     try:
-        body_json = json.loads(body_bytes) if body_bytes else {}
-    except json.JSONDecodeError:
-        body_json = {}
-    # Replay body for the route handler
-    async def _replay_receive():
+        body_json = orjson.loads(body_bytes) if body_bytes else {}
+    except orjson.JSONDecodeError:
+        # orjson is stricter than the stdlib parser handlers use via request.json()
+        # (NaN, Infinity, big integers); the policy must see what the handler sees
+        try:
+            body_json = json.loads(body_bytes)
+        except ValueError:
+            body_json = {}
+    return body_json if isinstance(body_json, dict) else {}
+
+
+async def _receive_body(receive: Receive) -> bytes:
+    """Drain the http.request messages from an ASGI receive channel."""
+    chunks: List[bytes] = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replay_receive(body_bytes: bytes, receive: Receive) -> Receive:
+    """Build a receive channel that replays the buffered body, then defers to the original."""
+    replayed = False
+
+    async def _receive() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
         return {"type": "http.request", "body": body_bytes, "more_body": False}
-    request.scope["receive"] = _replay_receive
+
+    return _receive
+
+
+def _cache_body(scope: Scope, body_bytes: bytes) -> Dict[str, Any]:
+    """Parse the body and cache bytes + JSON in the scope for later readers."""
+    body_json = _parse_body_json(body_bytes)
+    scope[_SCOPE_BODY_BYTES] = body_bytes
+    scope[_SCOPE_BODY_JSON] = body_json
     return body_json
 
 
+async def _read_and_replay_body(request: Request) -> Dict[str, Any]:
+    """Read request body once per request; reuse the copy cached in scope by an earlier reader."""
+    scope = request.scope
+    if _SCOPE_BODY_BYTES in scope:
+        return scope[_SCOPE_BODY_JSON]
+    body_bytes = await request.body()
+    # Replay body for the route handler
+    scope["receive"] = _replay_receive(body_bytes, request.receive)
+    return _cache_body(scope, body_bytes)
+
+
+# Top-level body keys that are verification inputs rather than policy context
+_CONTEXT_SKIP = frozenset(("passport", "policy"))
+
+
+def _context_from_body(body_json: Dict[str, Any]) -> Dict[str, Any]:
+    """Policy context from the body; returns body_json itself when nothing needs dropping."""
+    if "passport" not in body_json and "policy" not in body_json:
+        # Safe to share: the SDK copies context before adding its own keys
+        return body_json
+    context = body_json.copy()
+    for key in _CONTEXT_SKIP:
+        context.pop(key, None)
+    return context
+
+
+def _agent_state(passport: Dict[str, Any], agent_id: Optional[str]) -> Dict[str, Any]:
+    """Value for request.state.agent; reuses the passport dict when it already carries agent_id."""
+    if "agent_id" in passport:
+        return passport
+    return {"agent_id": agent_id, **passport}
+
+
+_CANONICAL_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def _canonical_dumps(data: Any) -> bytes:
+    """Stable bytes for data (sorted keys) for cache/dedup keys; equal contexts give equal bytes."""
+    return orjson.dumps(data, option=_CANONICAL_OPTS)
+
+
+def _decision_cache_key(agent_id: str, policy_id: str, context: Dict[str, Any]) -> bytes:
+    """Hash (agent_id, policy_id, context) into a compact cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(agent_id.encode())
+    h.update(b"\0")
+    h.update(policy_id.encode())
+    h.update(b"\0")
+    h.update(_canonical_dumps(context))
+    return h.digest()
+
+
+class _TTLCache:
+    """Small in-process TTL cache; concurrent misses for one key share a single load.
+
+    With coalesce=True, concurrent loads are shared even when ttl_seconds is 0
+    (nothing is kept once the load finishes).
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024, coalesce: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.coalesce = coalesce
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_for: Optional[Callable[[Any], float]] = None,
+    ) -> Any:
+        """Return the cached value for key, or await loader() and cache it.
+
+        ttl_for may return a shorter TTL for a given value; 0 skips caching it.
+        """
+        if self.ttl_seconds <= 0 and not self.coalesce:
+            return await loader()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                return entry[1]
+            del self._entries[key]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, ttl_for))
+            self._inflight[key] = task
+        # Shield so one caller's cancellation does not cancel the shared load
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_for: Optional[Callable[[Any], float]],
+    ) -> Any:
+        try:
+            value = await loader()
+            ttl = self.ttl_seconds if ttl_for is None else min(self.ttl_seconds, ttl_for(value))
+            if ttl > 0:
+                if len(self._entries) >= self.maxsize:
+                    # Evict the oldest insertion
+                    del self._entries[next(iter(self._entries))]
+                self._entries[key] = (time.monotonic() + ttl, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+
+def _decision_cache_ttl(decision: Union[PolicyVerificationResponse, Dict[str, Any]]) -> float:
+    """Only allow decisions are cached, never beyond the decision's own expires_in."""
+    if not _decision_allow(decision):
+        return 0
+    expires_in = decision.expires_in if isinstance(decision, PolicyVerificationResponse) else decision.get("expires_in")
+    return float("inf") if expires_in is None else expires_in
+
+
 def _decision_allow(decision: Union[PolicyVerificationResponse, Dict[str, Any]]) -> bool:
-    """Get .allow from SDK response (dataclass or dict)."""
-    if hasattr(decision, "allow"):
-        return bool(decision.allow)
-    return bool(decision.get("allow", False))
+    """Get .allow from SDK response (dataclass or dict); anything else denies."""
+    if isinstance(decision, PolicyVerificationResponse):
+        return decision.allow is True
+    if isinstance(decision, dict):
+        return decision.get("allow", False) is True
+    return False
 
 
 def _decision_meta(
     decision: Union[PolicyVerificationResponse, Dict[str, Any]],
 ) -> Dict[str, Any]:
     """Get decision_id and reasons from SDK response."""
-    if hasattr(decision, "decision_id"):
+    if isinstance(decision, PolicyVerificationResponse):
         return {
-            "decision_id": getattr(decision, "decision_id", None),
-            "reasons": getattr(decision, "reasons", None) or [],
+            "decision_id": decision.decision_id,
+            "reasons": decision.reasons or [],
         }
-    return {
-        "decision_id": decision.get("decision_id"),
-        "reasons": decision.get("reasons", []),
-    }
+    if isinstance(decision, dict):
+        return {
+            "decision_id": decision.get("decision_id"),
+            "reasons": decision.get("reasons", []),
+        }
+    return {"decision_id": None, "reasons": []}
 
 
-def should_skip_request(request: Request, skip_paths: List[str]) -> bool:
-    """Check if request should be skipped based on path."""
-    return any(request.url.path.startswith(path) for path in skip_paths)
+def _policy_result(decision: Union[PolicyVerificationResponse, Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize a decision for request.state.policy_result."""
+    if isinstance(decision, PolicyVerificationResponse):
+        return {
+            "decision_id": decision.decision_id,
+            "allow": decision.allow,
+            "reasons": decision.reasons or [],
+        }
+    return decision
+
+
+def should_skip_request(path: str, options: AgentPassportMiddlewareOptions) -> bool:
+    """Check if the raw ASGI path should be skipped based on options.skip_paths."""
+    return path in options._skip_exact or path.startswith(options._skip_paths_tuple)
+
+
+_MISSING_AGENT_MESSAGE = "Agent ID is required. Provide X-Agent-Passport-Id header or body.passport."
+_MISSING_AGENT_PARAM_MESSAGE = (
+    "Agent ID is required. Provide X-Agent-Passport-Id header, function parameter, or body.passport."
+)
+
+
+# Pre-serialized bodies for error shapes with no per-request fields
+_STATIC_ERROR_BODIES: Dict[Tuple[str, str], bytes] = {
+    (error, message): orjson.dumps({"error": error, "message": message})
+    for error, message in (
+        ("missing_agent_id", _MISSING_AGENT_MESSAGE),
+        ("missing_agent_id", _MISSING_AGENT_PARAM_MESSAGE),
+        ("internal_error", "Internal server error"),
+    )
+}
 
 
 def create_error_response(
@@ -149,8 +438,12 @@ def create_error_response(
     error: str,
     message: str,
     additional: Optional[Dict[str, Any]] = None,
-) -> JSONResponse:
+) -> Response:
     """Create error response."""
+    if not additional:
+        body = _STATIC_ERROR_BODIES.get((error, message))
+        if body is not None:
+            return Response(content=body, status_code=status_code, media_type="application/json")
     response_data = {
         "error": error,
         "message": message,
@@ -158,14 +451,223 @@ def create_error_response(
     if additional:
         response_data.update(additional)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=response_data,
     )
 
 
-class AgentPassportMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for Agent Passport verification using the thin client SDK."""
+class _PipelineOptions:
+    """Per-entry-point settings for _run_policy_pipeline, built once at setup time."""
+
+    __slots__ = (
+        "policy_id",
+        "agent_id",
+        "passport_from_body",
+        "policy_from_body",
+        "fail_closed",
+        "extra_context",
+        "missing_agent_message",
+        "reads_body",
+        "cache_ttl_seconds",
+        "passport_cache",
+        "decision_cache",
+    )
+
+    def __init__(
+        self,
+        policy_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        passport_from_body: bool = True,
+        policy_from_body: bool = True,
+        fail_closed: bool = True,
+        extra_context: Optional[Dict[str, Any]] = None,
+        missing_agent_message: str = _MISSING_AGENT_MESSAGE,
+        cache_ttl_seconds: float = 0.0,
+        coalesce_inflight: bool = False,
+    ):
+        self.policy_id = policy_id
+        self.agent_id = agent_id
+        self.passport_from_body = passport_from_body
+        self.policy_from_body = policy_from_body
+        self.fail_closed = fail_closed
+        self.extra_context = extra_context
+        self.missing_agent_message = missing_agent_message
+        self.reads_body = bool(policy_id or passport_from_body or policy_from_body)
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.passport_cache = _TTLCache(cache_ttl_seconds)
+        self.decision_cache = _TTLCache(cache_ttl_seconds, coalesce=coalesce_inflight)
+
+    @classmethod
+    def from_options(cls, options: AgentPassportMiddlewareOptions) -> "_PipelineOptions":
+        """Build pipeline settings from global middleware options."""
+        return cls(
+            policy_id=options.policy_id,
+            passport_from_body=options.passport_from_body,
+            policy_from_body=options.policy_from_body,
+            fail_closed=options.fail_closed,
+            cache_ttl_seconds=options.cache_ttl_seconds,
+            coalesce_inflight=options.coalesce_inflight,
+        )
+
+
+class _PolicyError(Exception):
+    """Verification outcome that must stop the request; rendered by each entry point."""
+
+    def __init__(
+        self,
+        status_code: int,
+        error: str,
+        message: str,
+        additional: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error = error
+        self.message = message
+        self.additional = additional
+
+    def to_response(self) -> Response:
+        """Render as a JSON error response (middleware entry points)."""
+        return create_error_response(self.status_code, self.error, self.message, self.additional)
+
+    def to_http_exception(self) -> HTTPException:
+        """Render as an HTTPException (dependency entry points)."""
+        detail = {"error": self.error, "message": self.message}
+        if self.additional:
+            detail.update(self.additional)
+        return HTTPException(status_code=self.status_code, detail=detail)
+
+
+def _upstream_status(error: AportError) -> int:
+    """HTTP status for an SDK failure: upstream 4xx pass through; network errors and 5xx are 502, timeouts 504."""
+    reasons = getattr(error, "reasons", None) or []
+    if any(isinstance(reason, dict) and reason.get("code") == "TIMEOUT" for reason in reasons):
+        return 504
+    if 400 <= error.status < 500:
+        return error.status
+    return 502
+
+
+async def _run_policy_pipeline(
+    client: APortClient,
+    opts: _PipelineOptions,
+    request: Request,
+) -> None:
+    """Verify the request; supports agent_id, body.passport and body.policy.
+
+    Returns None when the request may proceed (with request.state populated)
+    and raises _PolicyError otherwise.
+    """
+    try:
+        body_json: Dict[str, Any] = {}
+        if opts.reads_body and request.method == "POST":
+            body_json = await _read_and_replay_body(request)
+
+        body_passport = _dict_field(body_json, "passport") if opts.passport_from_body else None
+        body_policy = _dict_field(body_json, "policy") if opts.policy_from_body else None
+
+        # Same precedence as extract_agent_id: parameter, body.passport, headers
+        effective_agent_id = (
+            opts.agent_id
+            or (body_passport.get("agent_id") if body_passport else None)
+            or _header_agent_id(request.scope)
+        )
+        if not effective_agent_id and not body_passport:
+            if opts.fail_closed:
+                raise _PolicyError(401, "missing_agent_id", opts.missing_agent_message)
+            return None
+
+        if not opts.policy_id and not body_policy:
+            if body_passport:
+                request.state.agent = _agent_state(body_passport, None)
+                return None
+            try:
+                passport_view = await opts.passport_cache.get_or_load(
+                    effective_agent_id,
+                    lambda: client.get_passport_view(effective_agent_id),
+                )
+            except AportError as error:
+                raise _PolicyError(
+                    _upstream_status(error),
+                    "agent_verification_failed",
+                    str(error),
+                    {"agent_id": effective_agent_id},
+                )
+            if opts.cache_ttl_seconds > 0:
+                # Cached views are shared across requests; give each request its own copy
+                passport_view = passport_view.copy()
+            request.state.agent = _agent_state(passport_view, effective_agent_id)
+            return None
+
+        context = _context_from_body(body_json)
+        if opts.extra_context:
+            context = {**context, **opts.extra_context}
+
+        if body_policy:
+            agent_id_or_passport: Union[str, Dict[str, Any]] = body_passport if body_passport else effective_agent_id
+            decision = await client.verify_policy_with_policy_in_body(
+                agent_id_or_passport,
+                body_policy,
+                context,
+            )
+        elif body_passport:
+            decision = await client.verify_policy_with_passport(
+                body_passport,
+                opts.policy_id,
+                context,
+            )
+        elif opts.cache_ttl_seconds > 0 or opts.decision_cache.coalesce:
+            decision = await opts.decision_cache.get_or_load(
+                _decision_cache_key(effective_agent_id, opts.policy_id, context),
+                lambda: client.verify_policy(effective_agent_id, opts.policy_id, context),
+                _decision_cache_ttl,
+            )
+        else:
+            decision = await client.verify_policy(
+                effective_agent_id,
+                opts.policy_id,
+                context,
+            )
+
+        if not _decision_allow(decision):
+            meta = _decision_meta(decision)
+            raise _PolicyError(
+                403,
+                "policy_violation",
+                "Policy violation",
+                {
+                    "agent_id": effective_agent_id,
+                    "policy_id": opts.policy_id or (body_policy.get("id") if body_policy else None),
+                    **meta,
+                },
+            )
+
+        request.state.agent = {"agent_id": effective_agent_id}
+        request.state.policy_result = _policy_result(decision)
+        return None
+
+    except _PolicyError:
+        raise
+    except AportError as error:
+        raise _PolicyError(
+            _upstream_status(error),
+            "api_error",
+            str(error),
+            {"reasons": getattr(error, "reasons", [])},
+        )
+    except Exception:
+        logger.exception("Agent Passport middleware error")
+        raise _PolicyError(500, "internal_error", "Internal server error")
+
+
+class AgentPassportMiddleware:
+    """Pure ASGI middleware for Agent Passport verification using the thin client SDK.
+
+    Implemented directly against the ASGI spec rather than ``BaseHTTPMiddleware``
+    so that skipped and non-HTTP requests pass straight through without the
+    per-request task group, memory stream and response wrapping.
+    """
     
     def __init__(
         self,
@@ -181,7 +683,7 @@ class AgentPassportMiddleware(BaseHTTPMiddleware):
             options: Middleware configuration options
             **kwargs: Additional options passed from FastAPI add_middleware
         """
-        super().__init__(app)
+        self.app = app
         
         # Handle options passed directly as kwargs (from FastAPI add_middleware)
         if options is None:
@@ -199,107 +701,33 @@ class AgentPassportMiddleware(BaseHTTPMiddleware):
             timeout_ms=self.options.timeout_ms,
         )
         self.verifier = PolicyVerifier(self.client)
+        self._pipeline = _PipelineOptions.from_options(self.options)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request; support agent_id, passport in body, policy in body."""
-        try:
-            if should_skip_request(request, self.options.skip_paths):
-                return await call_next(request)
-
-            body_json: Dict[str, Any] = {}
-            if request.method == "POST" and (self.options.policy_id or self.options.passport_from_body or self.options.policy_from_body):
-                body_json = await _read_and_replay_body(request)
-
-            use_passport_from_body = self.options.passport_from_body
-            use_policy_from_body = self.options.policy_from_body
-            body_passport = body_json.get("passport") if use_passport_from_body and isinstance(body_json.get("passport"), dict) else None
-            body_policy = body_json.get("policy") if use_policy_from_body and isinstance(body_json.get("policy"), dict) else None
-
-            agent_id = extract_agent_id(
-                request,
-                body_json=body_json,
-                passport_from_body=use_passport_from_body,
-            )
-            if not agent_id and not body_passport:
-                if self.options.fail_closed:
-                    return create_error_response(
-                        401,
-                        "missing_agent_id",
-                        "Agent ID is required. Provide X-Agent-Passport-Id header or body.passport.",
-                    )
-                return await call_next(request)
-
-            effective_agent_id = agent_id or (body_passport.get("agent_id") if body_passport else None)
-
-            if not self.options.policy_id and not body_policy:
-                if body_passport:
-                    request.state.agent = {"agent_id": body_passport.get("agent_id"), **body_passport}
-                    return await call_next(request)
-                try:
-                    passport_view = await self.client.get_passport_view(effective_agent_id)
-                    request.state.agent = {"agent_id": effective_agent_id, **passport_view}
-                    return await call_next(request)
-                except AportError as error:
-                    return create_error_response(
-                        error.status,
-                        "agent_verification_failed",
-                        error.message,
-                        {"agent_id": effective_agent_id},
-                    )
-
-            context = {k: v for k, v in body_json.items() if k not in ("passport", "policy")}
-
-            if body_policy:
-                agent_id_or_passport: Union[str, Dict[str, Any]] = body_passport if body_passport else effective_agent_id
-                decision = await self.client.verify_policy_with_policy_in_body(
-                    agent_id_or_passport,
-                    body_policy,
-                    context,
-                )
-            elif body_passport:
-                decision = await self.client.verify_policy_with_passport(
-                    body_passport,
-                    self.options.policy_id,
-                    context,
-                )
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if should_skip_request(scope["path"], self.options):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "POST" and self._pipeline.reads_body:
+            # Buffer the body into the scope cache so the pipeline and the route can both read it
+            if _SCOPE_BODY_BYTES in scope:
+                body_bytes = scope[_SCOPE_BODY_BYTES]
             else:
-                decision = await self.client.verify_policy(
-                    effective_agent_id,
-                    self.options.policy_id,
-                    context,
-                )
+                body_bytes = await _receive_body(receive)
+                _cache_body(scope, body_bytes)
+            receive = _replay_receive(body_bytes, receive)
 
-            if not _decision_allow(decision):
-                meta = _decision_meta(decision)
-                return create_error_response(
-                    403,
-                    "policy_violation",
-                    "Policy violation",
-                    {
-                        "agent_id": effective_agent_id,
-                        "policy_id": self.options.policy_id or (body_policy.get("id") if body_policy else None),
-                        **meta,
-                    },
-                )
-
-            request.state.agent = {"agent_id": effective_agent_id}
-            request.state.policy_result = decision if isinstance(decision, dict) else {
-                "decision_id": getattr(decision, "decision_id", None),
-                "allow": getattr(decision, "allow", False),
-                "reasons": getattr(decision, "reasons", None) or [],
-            }
-            return await call_next(request)
-
-        except AportError as error:
-            return create_error_response(
-                error.status,
-                "api_error",
-                error.message,
-                {"reasons": getattr(error, "reasons", [])},
-            )
-        except Exception as error:
-            print(f"Agent Passport middleware error: {error}")
-            return create_error_response(500, "internal_error", "Internal server error")
+        try:
+            await _run_policy_pipeline(self.client, self._pipeline, Request(scope, receive))
+        except _PolicyError as error:
+            await error.to_response()(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
 
 def agent_passport_middleware(
@@ -314,198 +742,43 @@ def agent_passport_middleware(
     Returns:
         Middleware function
     """
-    opts = AgentPassportMiddlewareOptions(**(options.__dict__ if options else {}))
+    opts = options or AgentPassportMiddlewareOptions()
     client = create_client(
         base_url=opts.base_url,
         api_key=opts.api_key,
         timeout_ms=opts.timeout_ms,
     )
+    pipeline = _PipelineOptions.from_options(opts)
 
     async def middleware(request: Request, call_next):
-        try:
-            if should_skip_request(request, opts.skip_paths):
-                return await call_next(request)
-
-            body_json = {}
-            if request.method == "POST" and (opts.policy_id or opts.passport_from_body or opts.policy_from_body):
-                body_json = await _read_and_replay_body(request)
-
-            body_passport = body_json.get("passport") if opts.passport_from_body and isinstance(body_json.get("passport"), dict) else None
-            body_policy = body_json.get("policy") if opts.policy_from_body and isinstance(body_json.get("policy"), dict) else None
-
-            agent_id = extract_agent_id(request, body_json=body_json, passport_from_body=opts.passport_from_body)
-            if not agent_id and not body_passport:
-                if opts.fail_closed:
-                    return create_error_response(
-                        401,
-                        "missing_agent_id",
-                        "Agent ID is required. Provide X-Agent-Passport-Id header or body.passport.",
-                    )
-                return await call_next(request)
-
-            effective_agent_id = agent_id or (body_passport.get("agent_id") if body_passport else None)
-
-            if not opts.policy_id and not body_policy:
-                if body_passport:
-                    request.state.agent = {"agent_id": body_passport.get("agent_id"), **body_passport}
-                    return await call_next(request)
-                try:
-                    passport_view = await client.get_passport_view(effective_agent_id)
-                    request.state.agent = {"agent_id": effective_agent_id, **passport_view}
-                    return await call_next(request)
-                except AportError as error:
-                    return create_error_response(
-                        error.status,
-                        "agent_verification_failed",
-                        error.message,
-                        {"agent_id": effective_agent_id},
-                    )
-
-            context = {k: v for k, v in body_json.items() if k not in ("passport", "policy")}
-
-            if body_policy:
-                decision = await client.verify_policy_with_policy_in_body(
-                    body_passport or effective_agent_id,
-                    body_policy,
-                    context,
-                )
-            elif body_passport:
-                decision = await client.verify_policy_with_passport(
-                    body_passport,
-                    opts.policy_id,
-                    context,
-                )
-            else:
-                decision = await client.verify_policy(
-                    effective_agent_id,
-                    opts.policy_id,
-                    context,
-                )
-
-            if not _decision_allow(decision):
-                meta = _decision_meta(decision)
-                return create_error_response(
-                    403,
-                    "policy_violation",
-                    "Policy violation",
-                    {
-                        "agent_id": effective_agent_id,
-                        "policy_id": opts.policy_id or (body_policy.get("id") if body_policy else None),
-                        **meta,
-                    },
-                )
-
-            request.state.agent = {"agent_id": effective_agent_id}
-            request.state.policy_result = decision if isinstance(decision, dict) else {
-                "decision_id": getattr(decision, "decision_id", None),
-                "allow": getattr(decision, "allow", False),
-                "reasons": getattr(decision, "reasons", None) or [],
-            }
+        if should_skip_request(request.scope["path"], opts):
             return await call_next(request)
-
-        except AportError as error:
-            return create_error_response(
-                error.status,
-                "api_error",
-                error.message,
-                {"reasons": getattr(error, "reasons", [])},
-            )
-        except Exception as error:
-            print(f"Policy verification error: {error}")
-            return create_error_response(500, "internal_error", "Internal server error")
+        try:
+            await _run_policy_pipeline(client, pipeline, request)
+        except _PolicyError as error:
+            return error.to_response()
+        return await call_next(request)
 
     return middleware
 
 
 def require_policy(policy_id: str, agent_id: Optional[str] = None) -> Callable:
     """Route-specific dependency; supports agent_id, body.passport, body.policy."""
-    client = create_client()
+    pipeline = _PipelineOptions(
+        policy_id=policy_id,
+        agent_id=agent_id,
+        missing_agent_message=_MISSING_AGENT_PARAM_MESSAGE,
+    )
 
     async def policy_dependency(request: Request):
         try:
-            body_json = {}
-            if request.method == "POST":
-                body_json = await _read_and_replay_body(request)
-            body_passport = body_json.get("passport") if isinstance(body_json.get("passport"), dict) else None
-            body_policy = body_json.get("policy") if isinstance(body_json.get("policy"), dict) else None
-
-            extracted_agent_id = extract_agent_id(request, body_json=body_json, passport_from_body=True)
-            if not extracted_agent_id and not body_passport:
-                raise HTTPException(
-                    status_code=401,
-                    detail={
-                        "error": "missing_agent_id",
-                        "message": "Agent ID is required. Provide X-Agent-Passport-Id header, function parameter, or body.passport.",
-                    },
-                )
-            effective_agent_id = extracted_agent_id or (body_passport.get("agent_id") if body_passport else None)
-
-            context = {k: v for k, v in body_json.items() if k not in ("passport", "policy")}
-
-            if body_policy:
-                decision = await client.verify_policy_with_policy_in_body(
-                    body_passport or effective_agent_id,
-                    body_policy,
-                    context,
-                )
-            elif body_passport:
-                decision = await client.verify_policy_with_passport(
-                    body_passport,
-                    policy_id,
-                    context,
-                )
-            else:
-                decision = await client.verify_policy(
-                    effective_agent_id,
-                    policy_id,
-                    context,
-                )
-
-            if not _decision_allow(decision):
-                meta = _decision_meta(decision)
-                raise HTTPException(
-                    status_code=403,
-                    detail={
-                        "error": "policy_violation",
-                        "message": "Policy violation",
-                        "agent_id": effective_agent_id,
-                        "policy_id": policy_id,
-                        **meta,
-                    },
-                )
-
-            request.state.agent = {"agent_id": effective_agent_id}
-            request.state.policy_result = decision if isinstance(decision, dict) else {
-                "decision_id": getattr(decision, "decision_id", None),
-                "allow": getattr(decision, "allow", False),
-                "reasons": getattr(decision, "reasons", None) or [],
-            }
-            return {
-                "agent": request.state.agent,
-                "policy_result": request.state.policy_result,
-            }
-
-        except HTTPException:
-            # Re-raise HTTPException as-is
-            raise
-        except AportError as error:
-            raise HTTPException(
-                status_code=error.status,
-                detail={
-                    "error": "api_error",
-                    "message": error.message,
-                    "reasons": getattr(error, "reasons", [])
-                }
-            )
-        except Exception as error:
-            print(f"Policy verification error: {error}")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": "internal_error",
-                    "message": "Internal server error"
-                }
-            )
+            await _run_policy_pipeline(_get_default_client(), pipeline, request)
+        except _PolicyError as error:
+            raise error.to_http_exception()
+        return {
+            "agent": request.state.agent,
+            "policy_result": request.state.policy_result,
+        }
 
     return policy_dependency
 
@@ -516,98 +789,45 @@ def require_policy_with_context(
     agent_id: Optional[str] = None,
 ) -> Callable:
     """Route-specific middleware with custom context; supports body.passport, body.policy."""
-    client = create_client()
+    pipeline = _PipelineOptions(
+        policy_id=policy_id,
+        agent_id=agent_id,
+        extra_context=context,
+        missing_agent_message=_MISSING_AGENT_PARAM_MESSAGE,
+    )
 
     async def middleware(request: Request, call_next):
         try:
-            body_json = {}
-            if request.method == "POST":
-                body_json = await _read_and_replay_body(request)
-            body_passport = body_json.get("passport") if isinstance(body_json.get("passport"), dict) else None
-            body_policy = body_json.get("policy") if isinstance(body_json.get("policy"), dict) else None
-
-            extracted_agent_id = extract_agent_id(request, provided_agent_id=agent_id, body_json=body_json, passport_from_body=True)
-            if not extracted_agent_id and not body_passport:
-                return create_error_response(
-                    401,
-                    "missing_agent_id",
-                    "Agent ID is required. Provide X-Agent-Passport-Id header, function parameter, or body.passport.",
-                )
-            effective_agent_id = extracted_agent_id or (body_passport.get("agent_id") if body_passport else None)
-
-            request_context = {k: v for k, v in body_json.items() if k not in ("passport", "policy")}
-            merged_context = {**request_context, **context}
-
-            if body_policy:
-                decision = await client.verify_policy_with_policy_in_body(
-                    body_passport or effective_agent_id,
-                    body_policy,
-                    merged_context,
-                )
-            elif body_passport:
-                decision = await client.verify_policy_with_passport(
-                    body_passport,
-                    policy_id,
-                    merged_context,
-                )
-            else:
-                decision = await client.verify_policy(
-                    effective_agent_id,
-                    policy_id,
-                    merged_context,
-                )
-
-            if not _decision_allow(decision):
-                meta = _decision_meta(decision)
-                return create_error_response(
-                    403,
-                    "policy_violation",
-                    "Policy violation",
-                    {
-                        "agent_id": effective_agent_id,
-                        "policy_id": policy_id,
-                        **meta,
-                    },
-                )
-
-            request.state.agent = {"agent_id": effective_agent_id}
-            request.state.policy_result = decision if isinstance(decision, dict) else {
-                "decision_id": getattr(decision, "decision_id", None),
-                "allow": getattr(decision, "allow", False),
-                "reasons": getattr(decision, "reasons", None) or [],
-            }
-            return await call_next(request)
-
-        except AportError as error:
-            return create_error_response(
-                error.status,
-                "api_error",
-                error.message,
-                {"reasons": getattr(error, "reasons", [])},
-            )
-        except Exception as error:
-            print(f"Policy verification error: {error}")
-            return create_error_response(500, "internal_error", "Internal server error")
+            await _run_policy_pipeline(_get_default_client(), pipeline, request)
+        except _PolicyError as error:
+            return error.to_response()
+        return await call_next(request)
 
     return middleware
 
 
-# Convenience functions for specific policies
+# Convenience functions for specific policies. Cached so repeated calls return the
+# same dependency callable, which FastAPI then resolves once per request. The
+# dependency looks up the client per request, so no loop-bound client is cached.
+@functools.lru_cache(maxsize=128)
 def require_refund_policy(agent_id: Optional[str] = None) -> Callable:
     """Require refund policy."""
     return require_policy("finance.payment.refund.v1", agent_id)
 
 
+@functools.lru_cache(maxsize=128)
 def require_data_export_policy(agent_id: Optional[str] = None) -> Callable:
     """Require data export policy."""
     return require_policy("data.export.create.v1", agent_id)
 
 
+@functools.lru_cache(maxsize=128)
 def require_messaging_policy(agent_id: Optional[str] = None) -> Callable:
     """Require messaging policy."""
     return require_policy("messaging.message.send.v1", agent_id)
 
 
+@functools.lru_cache(maxsize=128)
 def require_repository_policy(agent_id: Optional[str] = None) -> Callable:
     """Require repository policy."""
     return require_policy("code.repository.merge.v1", agent_id)
@@ -620,49 +840,49 @@ async def get_decision_token(
     context: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Get decision token for near-zero latency validation."""
-    client = create_client()
+    client = _get_default_client()
     return await client.get_decision_token(agent_id, policy_id, context or {})
 
 
 async def validate_decision_token(token: str) -> Dict[str, Any]:
     """Validate decision token via server."""
-    client = create_client()
+    client = _get_default_client()
     resp = await client.validate_decision_token(token)
     return _response_to_dict(resp)
 
 
 async def validate_decision_token_local(token: str) -> Dict[str, Any]:
     """Validate decision token locally using JWKS."""
-    client = create_client()
+    client = _get_default_client()
     resp = await client.validate_decision_token_local(token)
     return _response_to_dict(resp)
 
 
 async def get_passport_view(agent_id: str) -> Dict[str, Any]:
     """Get passport view for debugging/about pages."""
-    client = create_client()
+    client = _get_default_client()
     return await client.get_passport_view(agent_id)
 
 
 async def get_jwks() -> Dict[str, Any]:
     """Get JWKS for local token validation."""
-    client = create_client()
+    client = _get_default_client()
     jwks = await client.get_jwks()
     return {"keys": jwks.keys} if hasattr(jwks, "keys") else jwks
 
 
 def _response_to_dict(resp: Union[PolicyVerificationResponse, Dict[str, Any]]) -> Dict[str, Any]:
     """Convert PolicyVerificationResponse to dict for API compatibility."""
-    if isinstance(resp, dict):
-        return resp
-    return {
-        "decision_id": getattr(resp, "decision_id", None),
-        "allow": getattr(resp, "allow", False),
-        "reasons": getattr(resp, "reasons", None) or [],
-        "assurance_level": getattr(resp, "assurance_level", None),
-        "expires_in": getattr(resp, "expires_in", None),
-        "created_at": getattr(resp, "created_at", None),
-    }
+    if isinstance(resp, PolicyVerificationResponse):
+        return {
+            "decision_id": resp.decision_id,
+            "allow": resp.allow,
+            "reasons": resp.reasons or [],
+            "assurance_level": resp.assurance_level,
+            "expires_in": resp.expires_in,
+            "created_at": resp.created_at,
+        }
+    return resp
 
 
 # Direct policy verification using PolicyVerifier (async; await required)
@@ -672,8 +892,7 @@ async def verify_refund(
     idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Verify refund policy."""
-    client = create_client()
-    verifier = PolicyVerifier(client)
+    verifier = _get_default_verifier()
     result = await verifier.verify_refund(agent_id, context, idempotency_key)
     return _response_to_dict(result)
 
@@ -684,8 +903,7 @@ async def verify_release(
     idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Verify release policy."""
-    client = create_client()
-    verifier = PolicyVerifier(client)
+    verifier = _get_default_verifier()
     result = await verifier.verify_release(agent_id, context, idempotency_key)
     return _response_to_dict(result)
 
@@ -696,8 +914,7 @@ async def verify_data_export(
     idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Verify data export policy."""
-    client = create_client()
-    verifier = PolicyVerifier(client)
+    verifier = _get_default_verifier()
     result = await verifier.verify_data_export(agent_id, context, idempotency_key)
     return _response_to_dict(result)
 
@@ -708,8 +925,7 @@ async def verify_messaging(
     idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Verify messaging policy."""
-    client = create_client()
-    verifier = PolicyVerifier(client)
+    verifier = _get_default_verifier()
     result = await verifier.verify_messaging(agent_id, context, idempotency_key)
     return _response_to_dict(result)
 
@@ -720,7 +936,6 @@ async def verify_repository(
     idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Verify repository policy."""
-    client = create_client()
-    verifier = PolicyVerifier(client)
+    verifier = _get_default_verifier()
     result = await verifier.verify_repository(agent_id, context, idempotency_key)
     return _response_to_dict(result)
\ No newline at end of file
@@ -3,12 +3,16 @@
 from typing import List, Optional, Dict, Any, Callable
 from dataclasses import dataclass
 
+from fastapi import Request, Response
+
 from aporthq_sdk_python import PassportData
+from aporthq_sdk_python.decision_types import _slotted
 
 # Re-export the shared type
 AgentPassport = PassportData
 
 
+@_slotted
 @dataclass
 class PolicyResult:
     """Policy evaluation result"""
@@ -17,6 +21,7 @@ class PolicyResult:
     error: Optional[Dict[str, Any]] = None
 
 
+@_slotted
 @dataclass
 class PolicyEvaluation:
     """Policy evaluation details"""
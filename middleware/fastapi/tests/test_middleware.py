@@ -1,5 +1,7 @@
 """Tests for the FastAPI middleware."""
 
+import asyncio
+import orjson
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import FastAPI, Request, Depends
@@ -14,7 +16,27 @@ from aporthq_middleware_fastapi import (
     require_data_export_policy,
     AgentPassportMiddlewareOptions,
 )
-from aporthq_sdk_python import AgentPassport, AportError
+from aporthq_middleware_fastapi import middleware as middleware_module
+from aporthq_middleware_fastapi.middleware import should_skip_request
+from aporthq_sdk_python import AgentPassport, AportError, PolicyVerificationResponse
+
+
+@pytest.fixture(autouse=True)
+def reset_default_client():
+    """Drop shared clients and cached dependencies so no state leaks between tests."""
+    def reset():
+        middleware_module._DEFAULT_CLIENTS.clear()
+        for helper in (
+            middleware_module.require_refund_policy,
+            middleware_module.require_data_export_policy,
+            middleware_module.require_messaging_policy,
+            middleware_module.require_repository_policy,
+        ):
+            helper.cache_clear()
+
+    reset()
+    yield
+    reset()
 
 
 class TestAgentPassportMiddleware:
@@ -107,6 +129,56 @@ class TestAgentPassportMiddleware:
             assert response.status_code == 200
             assert response.json()["status"] == "ok"
 
+    def test_should_skip_request_prefixes(self):
+        """Test skip_paths matches exact paths and nested prefixes."""
+        options = AgentPassportMiddlewareOptions(skip_paths=["/health", "/internal/metrics"])
+
+        assert should_skip_request("/health", options)
+        assert should_skip_request("/health/live", options)
+        assert should_skip_request("/internal/metrics/cpu", options)
+        assert not should_skip_request("/refund", options)
+
+        options.skip_paths = ["/refund"]
+        assert should_skip_request("/refund", options)
+        assert not should_skip_request("/health", options)
+
+    def test_options_are_slotted(self):
+        """Test options reject unknown attributes and kwargs overrides still apply."""
+        options = AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+
+        with pytest.raises(AttributeError):
+            options.polcy_id = "typo"
+        middleware = AgentPassportMiddleware(FastAPI(), options=options, fail_closed=False, unknown=True)
+        assert middleware.options.fail_closed is False
+
+    def test_policy_result_types_are_slotted(self):
+        """Test PolicyResult and PolicyEvaluation use __slots__ and keep their defaults."""
+        from aporthq_middleware_fastapi.types import PolicyEvaluation, PolicyResult
+
+        evaluation = PolicyEvaluation(decision_id="dec_123")
+        result = PolicyResult(allowed=True, evaluation={"decision_id": "dec_123"})
+
+        assert evaluation.violations == [] and evaluation.warnings == []
+        assert result.error is None
+        assert not hasattr(evaluation, "__dict__") and not hasattr(result, "__dict__")
+
+    def test_header_agent_id_precedence(self):
+        """Test X-Agent-Passport-Id wins over X-Agent-Id and empty values are ignored."""
+        header_agent_id = middleware_module._header_agent_id
+
+        assert header_agent_id({"headers": [(b"x-agent-id", b"ap_b"), (b"x-agent-passport-id", b"ap_a")]}) == "ap_a"
+        assert header_agent_id({"headers": [(b"x-agent-passport-id", b""), (b"x-agent-id", b"ap_b")]}) == "ap_b"
+        assert header_agent_id({"headers": [(b"content-type", b"application/json")]}) is None
+
+    def test_extract_agent_id_ignores_non_object_passport(self):
+        """Test body.passport is only used when it is a JSON object."""
+        request = Request({"type": "http", "headers": [(b"x-agent-id", b"ap_header")]})
+        extract_agent_id = middleware_module.extract_agent_id
+
+        assert extract_agent_id(request, body_json={"passport": {"agent_id": "ap_body"}}) == "ap_body"
+        assert extract_agent_id(request, body_json={"passport": "ap_body"}) == "ap_header"
+        assert extract_agent_id(request, provided_agent_id="ap_param", body_json={"passport": {"agent_id": "ap_body"}}) == "ap_param"
+
     @patch('aporthq_middleware_fastapi.middleware.create_client')
     def test_agent_passport_middleware_with_policy(self, mock_create_client):
         """Test middleware with policy enforcement."""
@@ -177,6 +249,349 @@ class TestAgentPassportMiddleware:
             assert response.status_code == 403
             assert response.json()["error"] == "policy_violation"
 
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_network_error(self, mock_create_client):
+        """Test an SDK network error (status 0) is reported as 502, not passed through."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(side_effect=AportError(
+            0, [{"code": "NETWORK_ERROR", "message": "Connection refused"}]
+        ))
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"success": True}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100, "currency": "USD"}
+            )
+
+            assert response.status_code == 502
+            assert response.json()["error"] == "api_error"
+            assert response.json()["reasons"][0]["code"] == "NETWORK_ERROR"
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_dataclass_decision(self, mock_create_client):
+        """Test SDK dataclass decisions are summarized into request.state."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value=PolicyVerificationResponse(
+            decision_id='dec_123',
+            allow=True,
+            reasons=None,
+        ))
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"policy_result": request.state.policy_result}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100, "currency": "USD"}
+            )
+
+            assert response.status_code == 200
+            assert response.json()["policy_result"] == {
+                "decision_id": "dec_123",
+                "allow": True,
+                "reasons": [],
+            }
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_caches_allow_decisions(self, mock_create_client):
+        """Test allow decisions are cached per agent, policy and context."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': True,
+            'reasons': [],
+            'expires_in': 60,
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(
+                policy_id="finance.payment.refund.v1",
+                cache_ttl_seconds=30,
+            )
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"success": True}
+
+        with TestClient(self.app) as client:
+            for body in ({"amount": 100, "currency": "USD"}, {"currency": "USD", "amount": 100}):
+                response = client.post(
+                    "/refund",
+                    headers={"X-Agent-Passport-Id": "ap_test123"},
+                    json=body
+                )
+                assert response.status_code == 200
+            assert mock_client.verify_policy.await_count == 1
+
+            client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 200, "currency": "USD"}
+            )
+            assert mock_client.verify_policy.await_count == 2
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_does_not_cache_denials(self, mock_create_client):
+        """Test deny decisions are always re-verified."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': False,
+            'reasons': [{"code": "INSUFFICIENT_PERMISSIONS", "message": "Access denied"}]
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(
+                policy_id="finance.payment.refund.v1",
+                cache_ttl_seconds=30,
+            )
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"success": True}
+
+        with TestClient(self.app) as client:
+            for _ in range(2):
+                response = client.post(
+                    "/refund",
+                    headers={"X-Agent-Passport-Id": "ap_test123"},
+                    json={"amount": 100, "currency": "USD"}
+                )
+                assert response.status_code == 403
+            assert mock_client.verify_policy.await_count == 2
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_passport_in_body(self, mock_create_client):
+        """Test body.passport is verified locally and excluded from the context."""
+        mock_client = Mock()
+        mock_client.verify_policy_with_passport = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': True,
+            'reasons': []
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"body": await request.json()}
+
+        passport = {"agent_id": "ap_body123", "status": "active"}
+        with TestClient(self.app) as client:
+            response = client.post("/refund", json={"passport": passport, "amount": 100})
+
+            assert response.status_code == 200
+            assert response.json()["body"] == {"passport": passport, "amount": 100}
+            mock_client.verify_policy_with_passport.assert_awaited_once_with(
+                passport,
+                "finance.payment.refund.v1",
+                {"amount": 100},
+            )
+
+    def test_agent_passport_middleware_passport_without_policy(self):
+        """Test body.passport becomes request.state.agent when no policy is set."""
+        self.app.add_middleware(AgentPassportMiddleware)
+
+        @self.app.post("/profile")
+        async def profile_endpoint(request: Request):
+            return {"agent": request.state.agent}
+
+        passport = {"agent_id": "ap_body123", "status": "active"}
+        with TestClient(self.app) as client:
+            response = client.post("/profile", json={"passport": passport})
+
+            assert response.status_code == 200
+            assert response.json()["agent"] == passport
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_replays_body(self, mock_create_client):
+        """Test the route can still read the body consumed by the middleware."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': True,
+            'reasons': []
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"body": await request.json()}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100, "currency": "USD"}
+            )
+
+            assert response.status_code == 200
+            assert response.json()["body"] == {"amount": 100, "currency": "USD"}
+            mock_client.verify_policy.assert_awaited_once_with(
+                "ap_test123",
+                "finance.payment.refund.v1",
+                {"amount": 100, "currency": "USD"},
+            )
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_body_rejected_by_orjson(self, mock_create_client):
+        """Test a body only the stdlib parser accepts (NaN) is still verified with its real context."""
+        mock_client = Mock()
+
+        async def verify_policy(agent_id, policy_id, context):
+            return {'decision_id': 'dec_123', 'allow': context.get("amount", 0) <= 1000, 'reasons': []}
+
+        mock_client.verify_policy = AsyncMock(side_effect=verify_policy)
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"amount": (await request.json())["amount"]}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123", "Content-Type": "application/json"},
+                content=b'{"amount": 1000000, "note": NaN}',
+            )
+
+            assert response.status_code == 403
+            assert mock_client.verify_policy.await_args[0][2]["amount"] == 1000000
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_reads_body_regardless_of_content_type(self, mock_create_client):
+        """Test a JSON payload sent as text/plain is still verified; request.json() ignores Content-Type."""
+        mock_client = Mock()
+
+        async def verify_policy(agent_id, policy_id, context):
+            return {'decision_id': 'dec_123', 'allow': context.get("amount", 0) <= 1000, 'reasons': []}
+
+        mock_client.verify_policy = AsyncMock(side_effect=verify_policy)
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"amount": (await request.json())["amount"]}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123", "Content-Type": "text/plain"},
+                content=b'{"amount": 1000000}',
+            )
+
+            assert response.status_code == 403
+            mock_client.verify_policy.assert_awaited_once_with(
+                "ap_test123",
+                "finance.payment.refund.v1",
+                {"amount": 1000000},
+            )
+
+
+class TestCreateErrorResponse:
+    """Test cases for create_error_response."""
+
+    def test_static_and_dynamic_bodies_match(self):
+        """Test prebuilt error bodies match the dynamically rendered shape."""
+        create_error_response = middleware_module.create_error_response
+        message = "Agent ID is required. Provide X-Agent-Passport-Id header or body.passport."
+
+        static = create_error_response(401, "missing_agent_id", message)
+        dynamic = create_error_response(401, "missing_agent_id", message, {"agent_id": None})
+
+        assert static.status_code == 401
+        assert static.headers["content-type"] == "application/json"
+        assert orjson.loads(static.body) == {"error": "missing_agent_id", "message": message}
+        assert orjson.loads(dynamic.body) == {"error": "missing_agent_id", "message": message, "agent_id": None}
+
+
+class TestAgentPassportMiddlewareFunction:
+    """Test cases for the agent_passport_middleware function."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.app = FastAPI()
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_agent_passport_middleware_function_policy_failure(self, mock_create_client):
+        """Test function middleware enforces the configured policy."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': False,
+            'reasons': [{"code": "INSUFFICIENT_PERMISSIONS", "message": "Access denied"}]
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.middleware("http")(agent_passport_middleware(
+            AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        ))
+
+        @self.app.post("/refund")
+        async def refund_endpoint(request: Request):
+            return {"success": True}
+
+        @self.app.get("/health")
+        async def health_endpoint():
+            return {"status": "ok"}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100, "currency": "USD"}
+            )
+            assert response.status_code == 403
+            assert response.json()["error"] == "policy_violation"
+            assert response.json()["policy_id"] == "finance.payment.refund.v1"
+
+            assert client.get("/health").status_code == 200
+
 
 class TestRequirePolicy:
     """Test cases for require_policy decorator."""
@@ -246,6 +661,144 @@ class TestRequirePolicy:
             assert response.status_code == 403
             assert response.json()["detail"]["error"] == "policy_violation"
 
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_require_policy_explicit_agent_id(self, mock_create_client):
+        """Test require_policy uses the agent_id it was configured with."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': True,
+            'reasons': []
+        })
+        mock_create_client.return_value = mock_client
+
+        @self.app.post("/refund")
+        async def refund_endpoint(
+            policy_data: dict = Depends(require_policy("finance.payment.refund.v1", "ap_explicit"))
+        ):
+            return {"policy_data": policy_data}
+
+        with TestClient(self.app) as client:
+            response = client.post("/refund", json={"amount": 100})
+
+            assert response.status_code == 200
+            assert response.json()["policy_data"]["agent"]["agent_id"] == "ap_explicit"
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_require_policy_api_error(self, mock_create_client):
+        """Test upstream 5xx errors surface as api_error with a 502."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(side_effect=AportError(
+            503, [{"code": "UPSTREAM_UNAVAILABLE", "message": "Try again"}]
+        ))
+        mock_create_client.return_value = mock_client
+
+        @self.app.post("/refund")
+        async def refund_endpoint(
+            policy_data: dict = Depends(require_policy("finance.payment.refund.v1"))
+        ):
+            return {"success": True}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100}
+            )
+
+            assert response.status_code == 502
+            assert response.json()["detail"]["error"] == "api_error"
+            assert response.json()["detail"]["reasons"][0]["code"] == "UPSTREAM_UNAVAILABLE"
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_require_policy_sdk_failures_map_to_gateway_status(self, mock_create_client):
+        """Test SDK network errors and timeouts become 502/504 while upstream 4xx pass through."""
+        mock_client = Mock()
+        mock_create_client.return_value = mock_client
+
+        @self.app.post("/refund")
+        async def refund_endpoint(
+            policy_data: dict = Depends(require_policy("finance.payment.refund.v1"))
+        ):
+            return {"success": True}
+
+        cases = [
+            (AportError(0, [{"code": "NETWORK_ERROR", "message": "Connection refused"}]), 502),
+            (AportError(408, [{"code": "TIMEOUT", "message": "Request timeout"}]), 504),
+            (AportError(404, [{"code": "NOT_FOUND", "message": "Unknown agent"}]), 404),
+        ]
+        with TestClient(self.app) as client:
+            for error, expected_status in cases:
+                mock_client.verify_policy = AsyncMock(side_effect=error)
+                response = client.post(
+                    "/refund",
+                    headers={"X-Agent-Passport-Id": "ap_test123"},
+                    json={"amount": 100}
+                )
+                assert response.status_code == expected_status
+                assert response.json()["detail"]["error"] == "api_error"
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_require_policy_internal_error_is_logged(self, mock_create_client, caplog):
+        """Test unexpected errors are logged and reported as internal_error."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(side_effect=RuntimeError("boom"))
+        mock_create_client.return_value = mock_client
+
+        @self.app.post("/refund")
+        async def refund_endpoint(
+            policy_data: dict = Depends(require_policy("finance.payment.refund.v1"))
+        ):
+            return {"success": True}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100}
+            )
+
+        assert response.status_code == 500
+        assert response.json()["detail"]["error"] == "internal_error"
+        record = next(r for r in caplog.records if r.name == "aporthq.middleware.fastapi")
+        assert record.exc_info[1].args == ("boom",)
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_require_policy_reuses_middleware_body(self, mock_create_client):
+        """Test require_policy reuses the body already read by the middleware."""
+        mock_client = Mock()
+        mock_client.verify_policy = AsyncMock(return_value={
+            'decision_id': 'dec_123',
+            'allow': True,
+            'reasons': []
+        })
+        mock_create_client.return_value = mock_client
+
+        self.app.add_middleware(
+            AgentPassportMiddleware,
+            options=AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+        )
+
+        @self.app.post("/refund")
+        async def refund_endpoint(
+            request: Request,
+            policy_data: dict = Depends(require_policy("finance.payment.refund.v1"))
+        ):
+            return {"cached": request.scope.get("_aport_body_json")}
+
+        with TestClient(self.app) as client:
+            response = client.post(
+                "/refund",
+                headers={"X-Agent-Passport-Id": "ap_test123"},
+                json={"amount": 100, "currency": "USD"}
+            )
+
+            assert response.status_code == 200
+            assert response.json()["cached"] == {"amount": 100, "currency": "USD"}
+            assert mock_client.verify_policy.await_count == 2
+            for call in mock_client.verify_policy.await_args_list:
+                assert call.args[2] == {"amount": 100, "currency": "USD"}
+
 
 class TestRequireRefundPolicy:
     """Test cases for require_refund_policy convenience function."""
@@ -322,4 +875,115 @@ class TestRequireDataExportPolicy:
             
             assert response.status_code == 200
             assert response.json()["success"] is True
-            assert response.json()["policy_data"]["agent"]["agent_id"] == "ap_test123"
\ No newline at end of file
+            assert response.json()["policy_data"]["agent"]["agent_id"] == "ap_test123"
+
+
+class TestDefaultClient:
+    """Test cases for the shared client used by the helpers."""
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    @pytest.mark.asyncio
+    async def test_helpers_share_one_client(self, mock_create_client):
+        """Test route helpers and direct functions reuse a single client within an event loop."""
+        mock_create_client.return_value = Mock()
+
+        client = middleware_module._get_default_client()
+
+        assert middleware_module._get_default_client() is client
+        assert middleware_module._get_default_verifier().client is client
+        assert mock_create_client.call_count == 1
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_default_client_per_event_loop(self, mock_create_client):
+        """Test a second asyncio.run gets its own client instead of one bound to a closed loop."""
+        mock_create_client.side_effect = lambda: Mock()
+
+        async def current_client():
+            return middleware_module._get_default_client()
+
+        first = asyncio.run(current_client())
+        second = asyncio.run(current_client())
+
+        assert second is not first
+        # The closed loop's client was dropped when the second one was created
+        assert len(middleware_module._DEFAULT_CLIENTS) == 1
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_convenience_dependencies_are_reused(self, mock_create_client):
+        """Test fixed-policy helpers return the same dependency per agent_id."""
+        mock_create_client.return_value = Mock()
+
+        assert require_refund_policy() is require_refund_policy()
+        assert require_refund_policy("ap_1") is not require_refund_policy("ap_2")
+
+    def test_create_client_returns_fresh_clients(self):
+        """Test create_client does not share clients (and their loop-bound sessions) between callers."""
+        first = middleware_module.create_client("https://api.example.test", "key", 1000)
+
+        assert middleware_module.create_client("https://api.example.test", "key", 1000) is not first
+
+    @patch('aporthq_middleware_fastapi.middleware.create_client')
+    def test_middleware_instances_own_their_client(self, mock_create_client):
+        """Test each middleware instance creates its own client, even with identical options."""
+        mock_create_client.side_effect = lambda **kwargs: Mock()
+        options = AgentPassportMiddlewareOptions(policy_id="finance.payment.refund.v1")
+
+        first = AgentPassportMiddleware(FastAPI(), options=options)
+        second = AgentPassportMiddleware(FastAPI(), options=options)
+
+        assert first.client is not second.client
+
+
+class TestDecisionCacheKey:
+    """Test cases for decision cache keys."""
+
+    def test_key_is_order_independent(self):
+        """Test equal contexts hash equally regardless of key order or key type."""
+        key = middleware_module._decision_cache_key
+
+        assert key("ap_1", "p.v1", {"a": 1, "b": {"x": 1, "y": 2}}) == key("ap_1", "p.v1", {"b": {"y": 2, "x": 1}, "a": 1})
+        assert key("ap_1", "p.v1", {"a": 1}) != key("ap_2", "p.v1", {"a": 1})
+        assert len(key("ap_1", "p.v1", {1: "non-str key"})) == 16
+
+
+class TestTTLCache:
+    """Test cases for the in-process TTL cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Test concurrent misses for the same key coalesce into one load."""
+        cache = middleware_module._TTLCache(ttl_seconds=30)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"agent_id": "ap_test123"}
+
+        results = await asyncio.gather(*[cache.get_or_load("ap_test123", loader) for _ in range(5)])
+
+        assert calls == 1
+        assert all(result == {"agent_id": "ap_test123"} for result in results)
+        assert await cache.get_or_load("ap_test123", loader) == {"agent_id": "ap_test123"}
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_without_ttl(self):
+        """Test coalescing shares in-flight loads and errors without caching results."""
+        cache = middleware_module._TTLCache(ttl_seconds=0, coalesce=True)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise AportError(503, [{"code": "UPSTREAM_UNAVAILABLE", "message": "Try again"}])
+
+        results = await asyncio.gather(*[cache.get_or_load(b"key", loader) for _ in range(3)], return_exceptions=True)
+
+        assert calls == 1
+        assert all(isinstance(result, AportError) for result in results)
+        with pytest.raises(AportError):
+            await cache.get_or_load(b"key", loader)
+        assert calls == 2
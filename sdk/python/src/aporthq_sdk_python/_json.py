@@ -0,0 +1,31 @@
+"""
+JSON encoding for API requests and responses: orjson when installed, stdlib json otherwise.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+
+    # Non-str dict keys are stringified like stdlib json; numpy scalars/arrays in contexts serialize natively
+    _DUMPS_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes in a single pass."""
+        return orjson.dumps(obj, option=_DUMPS_OPTS)
+
+else:
+    import json
+
+    JSONDecodeError = json.JSONDecodeError
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
@@ -0,0 +1,77 @@
+"""
+Local RS256 verification of decision tokens against JWKS keys (requires the optional cryptography package).
+"""
+
+import base64
+import time
+from typing import Any, Dict, List
+
+from . import _json
+from .decision_types import JwksKey
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa
+except ImportError:  # pragma: no cover - exercised only without cryptography
+    rsa = None
+
+AVAILABLE = rsa is not None
+
+
+class UnknownKeyError(ValueError):
+    """Token kid is not in the key set (the JWKS may have rotated)."""
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def public_keys(keys: List[JwksKey]) -> Dict[str, Any]:
+    """Build kid -> RSA public key for the RSA signing keys in a JWKS."""
+    result: Dict[str, Any] = {}
+    for key in keys:
+        if key.kty != "RSA" or (key.use and key.use != "sig"):
+            continue
+        numbers = rsa.RSAPublicNumbers(
+            int.from_bytes(_b64url_decode(key.e), "big"),
+            int.from_bytes(_b64url_decode(key.n), "big"),
+        )
+        result[key.kid] = numbers.public_key()
+    return result
+
+
+def verify(token: str, keys: Dict[str, Any]) -> Dict[str, Any]:
+    """Verify an RS256 JWT and its exp/nbf claims (exp required); returns the payload claims. Raises ValueError."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = _json.loads(_b64url_decode(header_b64))
+    except ValueError as exc:
+        raise ValueError("Malformed token") from exc
+
+    if header.get("alg") != "RS256":
+        raise ValueError(f"Unsupported token algorithm: {header.get('alg')}")
+    key = keys.get(header.get("kid"))
+    if key is None:
+        raise UnknownKeyError(f"Unknown signing key: {header.get('kid')}")
+
+    try:
+        key.verify(
+            _b64url_decode(signature_b64),
+            f"{header_b64}.{payload_b64}".encode("ascii"),
+            padding.PKCS1v15(),
+            hashes.SHA256(),
+        )
+    except InvalidSignature as exc:
+        raise ValueError("Invalid token signature") from exc
+
+    claims = _json.loads(_b64url_decode(payload_b64))
+    now = time.time()
+    # Decision tokens are short-lived: a token without exp would be valid forever
+    if "exp" not in claims:
+        raise ValueError("Token has no exp claim")
+    if now >= claims["exp"]:
+        raise ValueError("Token expired")
+    if "nbf" in claims and now < claims["nbf"]:
+        raise ValueError("Token not yet valid")
+    return claims
@@ -4,20 +4,19 @@ Aligns with POST /api/verify/policy/{pack_id}: context (required), passport (opt
 """
 
 import asyncio
-import json
+import functools
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
 
 import aiohttp
 from aiohttp import ClientTimeout, ClientError
 
+from . import _json, _jwt
 from .decision_types import (
     PolicyPack,
     PolicyVerificationRequestBody,
-    PolicyVerificationRequest,
     PolicyVerificationResponse,
     Jwks,
-    JwksKey,
 )
 from .errors import AportError
 
@@ -29,6 +28,143 @@ DEFAULT_HEADERS: Dict[str, str] = {
 }
 # Optional headers added by _get_headers(): Authorization (Bearer <api_key>), Idempotency-Key
 
+# Connection pool settings: verify traffic is bursty and goes to a single host, so keep
+# TCP+TLS connections alive between calls and cache DNS lookups.
+_CONNECTOR_OPTIONS: Dict[str, Any] = {
+    "limit": 100,
+    "limit_per_host": 32,
+    "keepalive_timeout": 75,
+    "ttl_dns_cache": 300,
+    "enable_cleanup_closed": True,
+}
+
+
+# Verify paths for the built-in policy packs, built once instead of formatted per call
+_VERIFY_POLICY_PATH = "/api/verify/policy/"
+_POLICY_IN_BODY_PATH = _VERIFY_POLICY_PATH + "IN_BODY"
+_POLICY_PATHS: Dict[str, str] = {
+    policy_id: _VERIFY_POLICY_PATH + policy_id
+    for policy_id in (
+        "finance.payment.refund.v1",
+        "code.release.publish.v1",
+        "data.export.create.v1",
+        "messaging.message.send.v1",
+        "code.repository.merge.v1",
+    )
+}
+
+
+def _policy_path(policy_id: str) -> str:
+    """Path for POST /api/verify/policy/{pack_id}."""
+    return _POLICY_PATHS.get(policy_id) or _VERIFY_POLICY_PATH + policy_id
+
+
+# JWKS is cached for 5 minutes, then revalidated with If-None-Match
+_JWKS_TTL_SECONDS = 5 * 60
+# A token with an unknown kid refetches JWKS (key rotation) at most this often
+_JWKS_REFRESH_COOLDOWN_SECONDS = 30
+# After a failed background JWKS prefetch, wait this long before trying again
+_JWKS_PREFETCH_BACKOFF_SECONDS = 30
+
+# Passport views and JWKS (x5c chains) can be large: stream them in chunks and refuse oversized bodies
+_STREAM_CHUNK_SIZE = 16384
+_MAX_STREAMED_RESPONSE_BYTES = 4 * 1024 * 1024
+
+
+async def _read_capped(content_length: Optional[int], chunks: AsyncIterator[bytes]) -> bytearray:
+    """Read a response body in chunks, raising AportError once it exceeds the size cap."""
+    if content_length is not None and content_length > _MAX_STREAMED_RESPONSE_BYTES:
+        raise _too_large_error()
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > _MAX_STREAMED_RESPONSE_BYTES:
+            raise _too_large_error()
+    return body
+
+
+def _too_large_error() -> AportError:
+    return AportError(
+        status=502,
+        reasons=[{"code": "RESPONSE_TOO_LARGE", "message": "Response body exceeds size limit"}],
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _join(base_url: str, path: str) -> str:
+    """Join a stripped base URL and a request path (memoized: the set of paths is small)."""
+    return base_url + (path if path.startswith("/") else "/" + path)
+
+
+def _network_error(error: Exception) -> AportError:
+    return AportError(
+        status=0,
+        reasons=[{"code": "NETWORK_ERROR", "message": str(error)}],
+    )
+
+
+def _timeout_error() -> AportError:
+    return AportError(
+        status=408,
+        reasons=[{"code": "TIMEOUT", "message": "Request timeout"}],
+    )
+
+
+class _HttpxTransport:
+    """HTTP/2 transport on httpx: concurrent calls multiplex over one connection instead of queuing per connection."""
+
+    def __init__(self, timeout_ms: int):
+        try:
+            import h2  # noqa: F401 - required by httpx for http2=True
+            import httpx
+        except ImportError as exc:
+            raise ImportError(
+                'transport="httpx" requires httpx with HTTP/2 support: pip install "aporthq-sdk-python[http2]"'
+            ) from exc
+        self._httpx = httpx
+        self._timeout = timeout_ms / 1000
+        self._client: Optional[Any] = None
+
+    def _new_client(self) -> Any:
+        return self._httpx.AsyncClient(
+            http2=True,
+            timeout=self._timeout,
+            headers=DEFAULT_HEADERS,
+            limits=self._httpx.Limits(max_keepalive_connections=20),
+        )
+
+    def _ensure_client(self) -> Any:
+        """Create the httpx client on first use and again after close(), like _ensure_session."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._new_client()
+        return self._client
+
+    async def send(
+        self, url: str, headers: Dict[str, str], body: Optional[bytes], stream: bool
+    ) -> Tuple[int, Mapping[str, str], Union[bytes, bytearray]]:
+        """Send GET (body is None) or POST; returns (status, response headers, raw body)."""
+        try:
+            async with self._ensure_client().stream(
+                "GET" if body is None else "POST", url, headers=headers, content=body
+            ) as response:
+                if stream:
+                    length = response.headers.get("content-length")
+                    raw = await _read_capped(
+                        int(length) if length is not None else None,
+                        response.aiter_bytes(_STREAM_CHUNK_SIZE),
+                    )
+                else:
+                    raw = await response.aread()
+                return response.status_code, response.headers, raw
+        except self._httpx.TimeoutException:
+            raise _timeout_error()
+        except self._httpx.HTTPError as e:
+            raise _network_error(e)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
 
 class APortClientOptions:
     """Configuration options for APortClient."""
@@ -38,24 +174,66 @@ class APortClientOptions:
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
         timeout_ms: int = 800,
+        transport: str = "aiohttp",
     ):
+        if transport not in ("aiohttp", "httpx"):
+            raise ValueError(f'transport must be "aiohttp" or "httpx", got {transport!r}')
         self.base_url = base_url or "https://api.aport.io"
         self.api_key = api_key
         self.timeout_ms = timeout_ms
+        self.transport = transport
 
 
 class APortClient:
     """Production-grade thin SDK Client for APort API."""
-    
+
+    # Keyed by (event loop, options): sessions and connectors belong to the loop that created them
+    _shared_clients: Dict[tuple, "APortClient"] = {}
+
     def __init__(self, options: APortClientOptions):
         self.opts = options
+        # Derived once; the hot path reuses these instead of re-formatting per request
+        self._base_url = options.base_url.rstrip("/")
+        self._auth_header = f"Bearer {options.api_key}" if options.api_key else None
+        # Shared by every request without an idempotency key; never mutate it
+        self._static_headers: Dict[str, str] = (
+            {"Authorization": self._auth_header} if self._auth_header else {}
+        )
         self.jwks_cache: Optional[Jwks] = None
-        self.jwks_cache_expiry: Optional[float] = None
+        self.jwks_cache_expiry: int = 0  # time.monotonic() seconds; 0 = expired
+        self._jwks_etag: Optional[str] = None
+        self._jwks_public_keys: Optional[Dict[str, Any]] = None
+        self._jwks_fetched_at = float("-inf")  # time.monotonic() of the last JWKS request
+        self._jwks_prefetch: Optional["asyncio.Task[None]"] = None
+        self._jwks_prefetch_retry_at = 0.0
         self._session: Optional[aiohttp.ClientSession] = None
+        self._http2: Optional[_HttpxTransport] = (
+            _HttpxTransport(options.timeout_ms) if options.transport == "httpx" else None
+        )
+
+    @classmethod
+    def shared(cls, options: Optional[APortClientOptions] = None) -> "APortClient":
+        """Client shared per running event loop and base_url/api_key/timeout/transport, so connections are pooled across callers.
+
+        Call from a coroutine: a second asyncio.run() (tests, CLI calls, worker restarts) gets a
+        new client instead of one whose session belongs to a closed loop. Prefer this over creating
+        a client per request. Only call close() on it at shutdown.
+        """
+        opts = options or APortClientOptions()
+        loop = asyncio.get_running_loop()
+        key = (loop, opts.base_url, opts.api_key, opts.timeout_ms, opts.transport)
+        client = cls._shared_clients.get(key)
+        if client is None:
+            # Drop clients of loops that have since closed; their sessions can no longer be used
+            for stale in [k for k in cls._shared_clients if k[0].is_closed()]:
+                del cls._shared_clients[stale]
+            client = cls._shared_clients[key] = cls(opts)
+        return client
 
     async def __aenter__(self):
         """Async context manager entry."""
-        await self._ensure_session()
+        if self._http2 is None:
+            await self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -63,85 +241,117 @@ class APortClient:
         await self.close()
 
     async def _ensure_session(self):
-        """Ensure HTTP session is created with default headers."""
+        """Ensure HTTP session is created with default headers and a pooled connector."""
         if self._session is None or self._session.closed:
             timeout = ClientTimeout(total=self.opts.timeout_ms / 1000)
             self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**_CONNECTOR_OPTIONS),
                 timeout=timeout,
                 headers=DEFAULT_HEADERS,
             )
 
     async def close(self):
         """Close the HTTP session."""
+        if self._jwks_prefetch is not None and not self._jwks_prefetch.done():
+            self._jwks_prefetch.cancel()
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._http2 is not None:
+            await self._http2.aclose()
 
     def _get_headers(self, idempotency_key: Optional[str] = None) -> Dict[str, str]:
-        """Request headers to merge with session defaults: Authorization, Idempotency-Key."""
-        headers: Dict[str, str] = {}
-        if self.opts.api_key:
-            headers["Authorization"] = f"Bearer {self.opts.api_key}"
-        if idempotency_key:
-            headers["Idempotency-Key"] = idempotency_key
-        return headers
+        """Request headers to merge with session defaults: Authorization, Idempotency-Key.
+
+        Without a key this returns the shared static dict; callers must copy before adding headers.
+        """
+        if not idempotency_key:
+            return self._static_headers
+        return {**self._static_headers, "Idempotency-Key": idempotency_key}
 
     def _normalize_url(self, path: str) -> str:
         """Normalize URL by removing trailing slashes and ensuring proper path."""
-        base_url = self.opts.base_url.rstrip("/")
-        clean_path = path if path.startswith("/") else f"/{path}"
-        return f"{base_url}{clean_path}"
+        return _join(self._base_url, path)
 
-    async def _make_request(
+    async def _post(
         self,
-        method: str,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
+        data: Dict[str, Any],
         idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Make HTTP request with proper error handling."""
-        await self._ensure_session()
-        
+        """POST a JSON body with proper error handling."""
+        _, _, json_data = await self._send(path, data, self._get_headers(idempotency_key))
+        return json_data
+
+    async def _get(self, path: str, *, stream: bool = False) -> Dict[str, Any]:
+        """GET with proper error handling."""
+        _, _, json_data = await self._send(path, None, self._get_headers(), stream=stream)
+        return json_data
+
+    async def _send(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        *,
+        stream: bool = False,
+    ) -> Tuple[int, Mapping[str, str], Dict[str, Any]]:
+        """POST data (or GET when data is None); returns (status, response headers, parsed body).
+
+        With stream=True the body is read in chunks and capped at _MAX_STREAMED_RESPONSE_BYTES.
+        Raises AportError on failure.
+        """
         url = self._normalize_url(path)
-        headers = self._get_headers(idempotency_key)
-        
+        # Serialize here (Content-Type is in DEFAULT_HEADERS) rather than via the HTTP library
+        body = _json.dumps(data) if data is not None else None
+        if self._http2 is not None:
+            status, response_headers, raw = await self._http2.send(url, headers, body, stream)
+        else:
+            status, response_headers, raw = await self._aiohttp_send(url, headers, body, stream)
+
+        server_timing = response_headers.get("server-timing")
         try:
-            async with self._session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-            ) as response:
-                server_timing = response.headers.get("server-timing")
-                text = await response.text()
-                
-                try:
-                    json_data = json.loads(text) if text else {}
-                except json.JSONDecodeError:
-                    json_data = {}
-                
-                if not response.ok:
-                    raise AportError(
-                        status=response.status,
-                        reasons=json_data.get("reasons"),
-                        decision_id=json_data.get("decision_id"),
-                        server_timing=server_timing,
-                        raw_response=text,
-                    )
-                
-                if server_timing:
-                    json_data["_meta"] = {"serverTiming": server_timing}
-                return json_data
-                
-        except ClientError as e:
+            json_data = _json.loads(raw) if raw else {}
+        except _json.JSONDecodeError:
+            json_data = {}
+
+        if status >= 400:
             raise AportError(
-                status=0,
-                reasons=[{"code": "NETWORK_ERROR", "message": str(e)}],
+                status=status,
+                reasons=json_data.get("reasons"),
+                decision_id=json_data.get("decision_id"),
+                server_timing=server_timing,
+                # Decoded only here so successful responses skip the extra pass
+                raw_response=raw.decode("utf-8", "replace"),
             )
+
+        if server_timing:
+            json_data["_meta"] = {"serverTiming": server_timing}
+        return status, response_headers, json_data
+
+    async def _aiohttp_send(
+        self, url: str, headers: Dict[str, str], body: Optional[bytes], stream: bool
+    ) -> Tuple[int, Mapping[str, str], Union[bytes, bytearray]]:
+        """Send GET (body is None) or POST on the pooled aiohttp session; returns (status, headers, raw body)."""
+        await self._ensure_session()
+
+        if body is None:
+            request = self._session.get(url=url, headers=headers)
+        else:
+            request = self._session.post(url=url, headers=headers, data=body)
+
+        try:
+            async with request as response:
+                if stream:
+                    raw = await _read_capped(
+                        response.content_length, response.content.iter_chunked(_STREAM_CHUNK_SIZE)
+                    )
+                else:
+                    raw = await response.read()
+                return response.status, response.headers, raw
+        except ClientError as e:
+            raise _network_error(e)
         except asyncio.TimeoutError:
-            raise AportError(
-                status=408,
-                reasons=[{"code": "TIMEOUT", "message": "Request timeout"}],
-            )
+            raise _timeout_error()
 
     def _build_policy_request_body(
         self,
@@ -154,7 +364,7 @@ class APortClient:
         policy: Optional[PolicyPack] = None,
     ) -> Dict[str, Any]:
         """Build request body for POST /api/verify/policy/{pack_id}. API expects context, optional passport, optional policy."""
-        ctx = dict(context or {})
+        ctx = context.copy() if context else {}
         if agent_id is not None:
             ctx["agent_id"] = agent_id
         if policy_id is not None:
@@ -187,9 +397,8 @@ class APortClient:
             passport=passport,
             policy=policy,
         )
-        path = "/api/verify/policy/IN_BODY" if policy is not None else f"/api/verify/policy/{policy_id}"
-        response_data = await self._make_request(
-            "POST",
+        path = _POLICY_IN_BODY_PATH if policy is not None else _policy_path(policy_id)
+        response_data = await self._post(
             path,
             data=body,
             idempotency_key=idempotency_key,
@@ -212,9 +421,8 @@ class APortClient:
             context=context or {},
             passport=passport,
         )
-        response_data = await self._make_request(
-            "POST",
-            f"/api/verify/policy/{policy_id}",
+        response_data = await self._post(
+            _policy_path(policy_id),
             data=body,
             idempotency_key=idempotency_key,
         )
@@ -242,9 +450,11 @@ class APortClient:
             passport=passport,
             policy=policy,
         )
-        response_data = await self._make_request(
-            "POST",
-            "/api/verify/policy/IN_BODY",
+        if self.jwks_cache is None and _jwt.AVAILABLE:
+            # Cold start: warm JWKS for local token validation in the background, off the verify path
+            self._start_jwks_prefetch()
+        response_data = await self._post(
+            _POLICY_IN_BODY_PATH,
             data=body,
             idempotency_key=idempotency_key,
         )
@@ -257,43 +467,72 @@ class APortClient:
         context: Dict[str, Any] = None,
     ) -> str:
         """Get a decision token for near-zero latency validation."""
-        if context is None:
-            context = {}
-            
-        request = PolicyVerificationRequest(
-            agent_id=agent_id,
-            context=context,
-        )
-        
-        response_data = await self._make_request(
-            "POST",
+        response_data = await self._post(
             f"/api/verify/token/{policy_id}",
-            data=request.__dict__,
+            data={"agent_id": agent_id, "context": context or {}},
         )
-        
         return response_data["token"]
 
     async def validate_decision_token_local(
         self, token: str
     ) -> PolicyVerificationResponse:
-        """Validate a decision token locally using JWKS."""
+        """Validate a decision token locally using JWKS (RS256).
+
+        Falls back to server validation when the cryptography package is not installed or JWKS
+        cannot be fetched or used. Tokens must carry an exp claim.
+        """
+        if not _jwt.AVAILABLE:
+            return await self.validate_decision_token(token)
         try:
-            jwks = await self.get_jwks()
-            # For now, we'll still use the server endpoint
-            # TODO: Implement local JWT validation with JWKS
+            keys = await self._get_jwks_public_keys()
+        except Exception:
+            # JWKS unavailable or malformed (e.g. an unusable key): let the server decide
             return await self.validate_decision_token(token)
+
+        try:
+            try:
+                claims = _jwt.verify(token, keys)
+            except _jwt.UnknownKeyError:
+                # Keys may have rotated: refresh and retry, but not more often than the cooldown,
+                # so tokens with made-up kids cannot drive traffic to the JWKS endpoint
+                if time.monotonic() < self._jwks_fetched_at + _JWKS_REFRESH_COOLDOWN_SECONDS:
+                    raise
+                self.jwks_cache_expiry = 0
+                claims = _jwt.verify(token, await self._get_jwks_public_keys())
+            return PolicyVerificationResponse.from_api_response(claims)
         except Exception:
             raise AportError(
                 401,
                 [{"code": "INVALID_TOKEN", "message": "Token validation failed"}],
             )
 
+    def _start_jwks_prefetch(self) -> None:
+        """Start a background JWKS fetch unless one is running or a recent one failed."""
+        if self._jwks_prefetch is not None and not self._jwks_prefetch.done():
+            return
+        if time.monotonic() < self._jwks_prefetch_retry_at:
+            return
+        self._jwks_prefetch = asyncio.ensure_future(self._prefetch_jwks())
+
+    async def _prefetch_jwks(self) -> None:
+        """Warm the JWKS cache; failures back off and are left to validate_decision_token_local."""
+        try:
+            await self.get_jwks()
+        except AportError:
+            self._jwks_prefetch_retry_at = time.monotonic() + _JWKS_PREFETCH_BACKOFF_SECONDS
+
+    async def _get_jwks_public_keys(self) -> Dict[str, Any]:
+        """kid -> public key for the current JWKS, rebuilt only when the key set changes."""
+        jwks = await self.get_jwks()
+        if self._jwks_public_keys is None:
+            self._jwks_public_keys = _jwt.public_keys(jwks.keys)
+        return self._jwks_public_keys
+
     async def validate_decision_token(
         self, token: str
     ) -> PolicyVerificationResponse:
         """Validate a decision token via server (for debugging)."""
-        response_data = await self._make_request(
-            "POST",
+        response_data = await self._post(
             "/api/verify/token/validate",
             data={"token": token},
         )
@@ -301,22 +540,26 @@ class APortClient:
 
     async def get_passport_view(self, agent_id: str) -> Dict[str, Any]:
         """Get passport verification view (for debugging/about pages)."""
-        return await self._make_request("GET", f"/api/passports/{agent_id}/verify_view")
+        return await self._get(f"/api/passports/{agent_id}/verify_view", stream=True)
 
     async def get_jwks(self) -> Jwks:
-        """Get JWKS for local token validation."""
-        # Check cache first
-        if (
-            self.jwks_cache
-            and self.jwks_cache_expiry
-            and time.time() < self.jwks_cache_expiry
-        ):
+        """Get JWKS for local token validation (cached; revalidated with If-None-Match)."""
+        if self.jwks_cache is not None and time.monotonic() < self.jwks_cache_expiry:
             return self.jwks_cache
 
+        headers = self._get_headers()
+        if self.jwks_cache is not None and self._jwks_etag:
+            headers = {**headers, "If-None-Match": self._jwks_etag}
+        self._jwks_fetched_at = time.monotonic()
         try:
-            response_data = await self._make_request("GET", "/jwks.json")
-            self.jwks_cache = Jwks(**response_data)
-            self.jwks_cache_expiry = time.time() + (5 * 60)  # Cache for 5 minutes
+            status, response_headers, response_data = await self._send(
+                "/jwks.json", None, headers, stream=True
+            )
+            if status != 304:
+                self.jwks_cache = Jwks.from_api_response(response_data)
+                self._jwks_etag = response_headers.get("etag")
+                self._jwks_public_keys = None
+            self.jwks_cache_expiry = int(time.monotonic()) + _JWKS_TTL_SECONDS
             return self.jwks_cache
         except Exception:
             raise AportError(
@@ -327,10 +570,63 @@ class APortClient:
 
 class PolicyVerifier:
     """Convenience class for policy-specific verification methods."""
-    
+
+    REFUND_POLICY_ID = "finance.payment.refund.v1"
+    RELEASE_POLICY_ID = "code.release.publish.v1"
+    DATA_EXPORT_POLICY_ID = "data.export.create.v1"
+    MESSAGING_POLICY_ID = "messaging.message.send.v1"
+    REPOSITORY_POLICY_ID = "code.repository.merge.v1"
+
+    # policy_id -> verify path for the methods below
+    _PATHS: Dict[str, str] = _POLICY_PATHS
+
     def __init__(self, client: APortClient):
         self.client = client
 
+    async def _verify(
+        self,
+        policy_id: str,
+        agent_id: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str],
+    ) -> PolicyVerificationResponse:
+        """Fixed-shape verify_policy for the built-in packs: no passport/policy in body, path precomputed."""
+        body = self.client._build_policy_request_body(
+            agent_id=agent_id,
+            policy_id=policy_id,
+            idempotency_key=idempotency_key,
+            context=context,
+        )
+        response_data = await self.client._post(
+            self._PATHS[policy_id],
+            data=body,
+            idempotency_key=idempotency_key,
+        )
+        return PolicyVerificationResponse.from_api_response(response_data)
+
+    async def verify_many(
+        self,
+        agent_id: str,
+        specs: List[Tuple[str, Dict[str, Any]]],
+        *,
+        concurrency: int = 16,
+    ) -> List[Union[PolicyVerificationResponse, BaseException]]:
+        """Verify several (policy_id, context) pairs concurrently over the client's pooled session.
+
+        Results are returned in the order of specs; a failed verification yields its exception
+        in place instead of cancelling the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def verify_one(policy_id: str, context: Dict[str, Any]) -> PolicyVerificationResponse:
+            async with semaphore:
+                return await self.client.verify_policy(agent_id, policy_id, context)
+
+        return await asyncio.gather(
+            *(verify_one(policy_id, context) for policy_id, context in specs),
+            return_exceptions=True,
+        )
+
     async def verify_refund(
         self,
         agent_id: str,
@@ -338,9 +634,7 @@ class PolicyVerifier:
         idempotency_key: Optional[str] = None,
     ) -> PolicyVerificationResponse:
         """Verify the finance.payment.refund.v1 policy."""
-        return await self.client.verify_policy(
-            agent_id, "finance.payment.refund.v1", context, idempotency_key
-        )
+        return await self._verify(self.REFUND_POLICY_ID, agent_id, context, idempotency_key)
 
     async def verify_release(
         self,
@@ -349,9 +643,7 @@ class PolicyVerifier:
         idempotency_key: Optional[str] = None,
     ) -> PolicyVerificationResponse:
         """Verify the code.release.publish.v1 policy."""
-        return await self.client.verify_policy(
-            agent_id, "code.release.publish.v1", context, idempotency_key
-        )
+        return await self._verify(self.RELEASE_POLICY_ID, agent_id, context, idempotency_key)
 
     async def verify_data_export(
         self,
@@ -360,9 +652,7 @@ class PolicyVerifier:
         idempotency_key: Optional[str] = None,
     ) -> PolicyVerificationResponse:
         """Verify the data.export.create.v1 policy."""
-        return await self.client.verify_policy(
-            agent_id, "data.export.create.v1", context, idempotency_key
-        )
+        return await self._verify(self.DATA_EXPORT_POLICY_ID, agent_id, context, idempotency_key)
 
     async def verify_messaging(
         self,
@@ -371,9 +661,7 @@ class PolicyVerifier:
         idempotency_key: Optional[str] = None,
     ) -> PolicyVerificationResponse:
         """Verify the messaging.message.send.v1 policy."""
-        return await self.client.verify_policy(
-            agent_id, "messaging.message.send.v1", context, idempotency_key
-        )
+        return await self._verify(self.MESSAGING_POLICY_ID, agent_id, context, idempotency_key)
 
     async def verify_repository(
         self,
@@ -382,6 +670,4 @@ class PolicyVerifier:
         idempotency_key: Optional[str] = None,
     ) -> PolicyVerificationResponse:
         """Verify the code.repository.merge.v1 policy."""
-        return await self.client.verify_policy(
-            agent_id, "code.repository.merge.v1", context, idempotency_key
-        )
\ No newline at end of file
+        return await self._verify(self.REPOSITORY_POLICY_ID, agent_id, context, idempotency_key)
\ No newline at end of file
@@ -4,8 +4,21 @@ Align with POST /api/verify/policy/{pack_id}:
   body.context (required), body.passport (optional), body.policy (optional; required when pack_id is IN_BODY).
 """
 
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional, Union
+from dataclasses import dataclass, field, fields
+
+
+def _slotted(cls: type) -> type:
+    """Rebuild a dataclass with __slots__ for its own fields (dataclass(slots=True) needs Python 3.10+)."""
+    own_fields = {f.name for f in fields(cls)}
+    names = tuple(name for name in cls.__dict__.get("__annotations__", {}) if name in own_fields)
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)  # defaults live in __init__; a class attribute would clash with the slot
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
 
 
 # Minimal OAP policy pack when supplying policy in body (pack_id = IN_BODY)
@@ -33,6 +46,7 @@ class PolicyVerificationRequest:
     policy: Optional[PolicyPack] = None  # policy in body (use path IN_BODY)
 
 
+@_slotted
 @dataclass
 class PolicyVerificationResponse:
     """Canonical response shape for policy verification (inner decision object from API)."""
@@ -47,19 +61,24 @@ class PolicyVerificationResponse:
     created_at: Optional[str] = None
     _meta: Optional[Dict[str, Any]] = None  # Server-Timing, etc.
 
+    _FIELDS: ClassVar[FrozenSet[str]] = frozenset()  # set below, once the dataclass fields exist
+
     @classmethod
     def from_api_response(cls, data: Dict[str, Any]) -> "PolicyVerificationResponse":
         """Build from API response; unwraps .decision when present."""
         decision = data.get("decision")
-        payload = dict(decision) if decision is not None else dict(data)
-        if "_meta" in data and "_meta" not in payload:
-            payload["_meta"] = data["_meta"]
-        fields = set(cls.__dataclass_fields__)
-        kwargs = {k: payload[k] for k in fields if k in payload}
+        src = decision if decision is not None else data
+        kwargs = {k: src[k] for k in cls._FIELDS if k in src}
+        if "_meta" not in kwargs and "_meta" in data:
+            kwargs["_meta"] = data["_meta"]
         return cls(**kwargs)
 
 
+PolicyVerificationResponse._FIELDS = frozenset(f.name for f in fields(PolicyVerificationResponse))
+
+
 # Legacy types for backward compatibility
+@_slotted
 @dataclass
 class DecisionReason:
     """Reason for a policy decision."""
@@ -69,6 +88,7 @@ class DecisionReason:
     severity: str  # "info" | "warning" | "error"
 
 
+@_slotted
 @dataclass
 class Decision(PolicyVerificationResponse):
     """Policy decision result (legacy compatibility)."""
@@ -86,21 +106,32 @@ class VerificationContext:
 
 
 # JWKS support for local token validation
+@_slotted
 @dataclass
 class JwksKey:
     """JSON Web Key."""
     
     kty: str
-    use: str
     kid: str
-    x5t: str
     n: str
     e: str
-    x5c: List[str]
+    # Optional per RFC 7517
+    use: Optional[str] = None
+    x5t: Optional[str] = None
+    x5c: List[str] = field(default_factory=list)
 
 
+@_slotted
 @dataclass
 class Jwks:
     """JSON Web Key Set."""
     
-    keys: List[JwksKey]
\ No newline at end of file
+    keys: List[JwksKey]
+
+    @classmethod
+    def from_api_response(cls, data: Dict[str, Any]) -> "Jwks":
+        """Build from /jwks.json response; ignores key members JwksKey does not model (e.g. alg)."""
+        known = JwksKey.__dataclass_fields__
+        return cls(
+            keys=[JwksKey(**{k: v for k, v in key.items() if k in known}) for key in data.get("keys", [])]
+        )
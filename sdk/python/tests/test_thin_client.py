@@ -3,6 +3,8 @@ Tests for the production-grade thin client implementation.
 """
 
 import asyncio
+import base64
+import time
 import pytest
 import json
 from unittest.mock import AsyncMock, Mock, patch
@@ -14,6 +16,7 @@ from aporthq_sdk_python import (
     PolicyVerifier,
     AportError,
     PolicyVerificationResponse,
+    Jwks,
 )
 
 
@@ -27,7 +30,16 @@ def create_mock_session(response_data, status=200, headers=None):
     mock_response_obj.ok = status < 400
     mock_response_obj.status = status
     mock_response_obj.headers = headers
-    mock_response_obj.text = AsyncMock(return_value=json.dumps(response_data))
+    body = json.dumps(response_data).encode()
+    mock_response_obj.read = AsyncMock(return_value=body)
+    mock_response_obj.content_length = len(body)
+
+    async def iter_chunked(size):
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+
+    mock_response_obj.content = Mock()
+    mock_response_obj.content.iter_chunked = iter_chunked
 
     # Create a mock context manager for the request
     class MockRequestContext:
@@ -42,12 +54,51 @@ def create_mock_session(response_data, status=200, headers=None):
 
     # Create a mock session
     mock_session = AsyncMock()
-    mock_session.request = Mock(return_value=MockRequestContext(mock_response_obj))
+    mock_session.post = Mock(return_value=MockRequestContext(mock_response_obj))
+    mock_session.get = Mock(return_value=MockRequestContext(mock_response_obj))
     mock_session.closed = False
     
     return mock_session
 
 
+def make_signed_token(private_key, claims, kid="key-1"):
+    """Helper to sign an RS256 JWT with a test key."""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    def b64url(data):
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+    signing_input = ".".join(
+        b64url(json.dumps(part).encode())
+        for part in ({"alg": "RS256", "typ": "JWT", "kid": kid}, claims)
+    )
+    signature = private_key.sign(signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{b64url(signature)}"
+
+
+def jwks_for(private_key, kid="key-1"):
+    """Helper to build a minimal JWKS response (no x5t/x5c) for a test key."""
+    numbers = private_key.public_key().public_numbers()
+
+    def b64url_int(value):
+        raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    return {
+        "keys": [
+            {
+                "kty": "RSA",
+                "use": "sig",
+                "kid": kid,
+                "alg": "RS256",
+                "n": b64url_int(numbers.n),
+                "e": b64url_int(numbers.e),
+            }
+        ]
+    }
+
+
 class TestAPortClient:
     """Test the APortClient class."""
 
@@ -90,13 +141,15 @@ class TestAPortClient:
             )
 
             # Verify request was made correctly
-            mock_session.request.assert_called_once()
-            call_args = mock_session.request.call_args
-            assert call_args[1]["method"] == "POST"
+            mock_session.post.assert_called_once()
+            call_args = mock_session.post.call_args
             assert call_args[1]["url"] == "https://api.aport.io/api/verify/policy/finance.payment.refund.v1"
             assert "Authorization" in call_args[1]["headers"]
             assert call_args[1]["headers"]["Authorization"] == "Bearer test-api-key"
             assert call_args[1]["headers"]["Idempotency-Key"] == "test-key"
+            body = json.loads(call_args[1]["data"])
+            assert body["context"]["amount"] == 1000
+            assert body["context"]["agent_id"] == "test-agent"
 
             # Verify response
             assert result.decision_id == "dec_123"
@@ -137,6 +190,73 @@ class TestAPortClient:
             assert result.reasons[0]["code"] == "INSUFFICIENT_CAPABILITIES"
             assert result.reasons[0]["severity"] == "error"
 
+    @pytest.mark.asyncio
+    async def test_verify_policy_with_policy_in_body(self):
+        """Test the policy pack is serialized into the body in one pass, including non-str keys."""
+        mock_session = create_mock_session({"decision_id": "dec_789", "allow": True})
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+
+        policy = {"id": "custom.policy.v1", "requires_capabilities": ["x"], "limits": {1: "tier-1"}}
+        result = await client.verify_policy_with_policy_in_body("test-agent", policy, {"amount": 5})
+
+        call_args = mock_session.post.call_args
+        assert isinstance(call_args[1]["data"], bytes)
+        assert call_args[1]["url"] == "https://api.aport.io/api/verify/policy/IN_BODY"
+        body = json.loads(call_args[1]["data"])
+        assert body["policy"]["limits"] == {"1": "tier-1"}
+        assert body["context"]["policy_id"] == "custom.policy.v1"
+        assert result.decision_id == "dec_789"
+
+    @pytest.mark.asyncio
+    async def test_policy_in_body_prefetches_jwks(self):
+        """Test the first IN_BODY verify starts one background JWKS fetch and does not wait for it."""
+        pytest.importorskip("cryptography")
+        mock_session = create_mock_session({"decision_id": "dec_789", "allow": True})
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+        policy = {"id": "custom.policy.v1", "requires_capabilities": ["x"]}
+
+        # A JWKS endpoint that never answers must not hold up decisions
+        never = asyncio.Event()
+        client.get_jwks = AsyncMock(side_effect=never.wait)
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                client.verify_policy_with_policy_in_body("test-agent", policy),
+                client.verify_policy_with_policy_in_body("test-agent", policy),
+            ),
+            timeout=1,
+        )
+        assert [result.decision_id for result in results] == ["dec_789", "dec_789"]
+        assert client.get_jwks.call_count == 1
+        await client.close()
+        with pytest.raises(asyncio.CancelledError):
+            await client._jwks_prefetch
+
+    @pytest.mark.asyncio
+    async def test_failed_jwks_prefetch_backs_off(self):
+        """Test a failed background JWKS fetch is not retried on every call."""
+        pytest.importorskip("cryptography")
+        mock_session = create_mock_session({"decision_id": "dec_789", "allow": True})
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+        policy = {"id": "custom.policy.v1", "requires_capabilities": ["x"]}
+
+        client.get_jwks = AsyncMock(side_effect=AportError(500, [{"code": "JWKS_FETCH_FAILED", "message": "x"}]))
+        await client.verify_policy_with_policy_in_body("test-agent", policy)
+        await client._jwks_prefetch
+        await client.verify_policy_with_policy_in_body("test-agent", policy)
+        client.get_jwks.assert_awaited_once()
+
+        # Once the backoff has passed, the next cold call tries again
+        client._jwks_prefetch_retry_at = 0.0
+        await client.verify_policy_with_policy_in_body("test-agent", policy)
+        await client._jwks_prefetch
+        assert client.get_jwks.await_count == 2
+
     @pytest.mark.asyncio
     async def test_verify_policy_api_error(self):
         """Test policy verification with API error."""
@@ -164,6 +284,7 @@ class TestAPortClient:
             assert exc_info.value.status == 400
             assert exc_info.value.reasons == error_response["reasons"]
             assert exc_info.value.decision_id == "dec_error"
+            assert json.loads(exc_info.value.raw_response) == error_response
 
     @pytest.mark.asyncio
     async def test_get_decision_token(self):
@@ -180,10 +301,13 @@ class TestAPortClient:
                 "test-agent", "finance.payment.refund.v1", {"amount": 1000, "currency": "USD"}
             )
 
-            mock_session.request.assert_called_once()
-            call_args = mock_session.request.call_args
-            assert call_args[1]["method"] == "POST"
+            mock_session.post.assert_called_once()
+            call_args = mock_session.post.call_args
             assert call_args[1]["url"] == "https://api.aport.io/api/verify/token/finance.payment.refund.v1"
+            assert json.loads(call_args[1]["data"]) == {
+                "agent_id": "test-agent",
+                "context": {"amount": 1000, "currency": "USD"},
+            }
             assert result == "jwt_token_123"
 
     @pytest.mark.asyncio
@@ -207,9 +331,8 @@ class TestAPortClient:
             client._session = mock_session
             result = await client.validate_decision_token("jwt_token_123")
 
-            mock_session.request.assert_called_once()
-            call_args = mock_session.request.call_args
-            assert call_args[1]["method"] == "POST"
+            mock_session.post.assert_called_once()
+            call_args = mock_session.post.call_args
             assert call_args[1]["url"] == "https://api.aport.io/api/verify/token/validate"
             assert result.decision_id == "dec_789"
 
@@ -230,12 +353,221 @@ class TestAPortClient:
             client._session = mock_session
             result = await client.get_passport_view("test-agent")
 
-            mock_session.request.assert_called_once()
-            call_args = mock_session.request.call_args
-            assert call_args[1]["method"] == "GET"
+            mock_session.get.assert_called_once()
+            mock_session.post.assert_not_called()
+            call_args = mock_session.get.call_args
             assert call_args[1]["url"] == "https://api.aport.io/api/passports/test-agent/verify_view"
             assert result["agent_id"] == "test-agent"
 
+    @pytest.mark.asyncio
+    async def test_get_jwks_revalidates_with_etag(self):
+        """Test JWKS keys are parsed and a 304 revalidation keeps the cached set."""
+        jwks_response = {
+            "keys": [
+                {
+                    "kty": "RSA",
+                    "use": "sig",
+                    "kid": "key-1",
+                    "alg": "RS256",
+                    "x5t": "thumb",
+                    "n": "modulus",
+                    "e": "AQAB",
+                    "x5c": [],
+                }
+            ]
+        }
+        mock_session = create_mock_session(jwks_response, headers={"etag": '"v1"'})
+
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+
+        jwks = await client.get_jwks()
+        assert jwks.keys[0].kid == "key-1"
+        assert "If-None-Match" not in mock_session.get.call_args[1]["headers"]
+        assert isinstance(client.jwks_cache_expiry, int)
+        assert await client.get_jwks() is jwks
+        assert mock_session.get.call_count == 1
+
+        # Expire the cache; the server answers 304 with an empty body
+        client.jwks_cache_expiry = 0
+        not_modified = create_mock_session({}, status=304)
+        client._session = not_modified
+        assert await client.get_jwks() is jwks
+        assert not_modified.get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+        assert "If-None-Match" not in client._get_headers()
+
+    @pytest.mark.asyncio
+    async def test_validate_decision_token_local(self):
+        """Test decision tokens are verified against JWKS without a server round trip."""
+        rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        mock_session = create_mock_session(jwks_for(private_key))
+
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+
+        token = make_signed_token(
+            private_key,
+            {"decision_id": "dec_local", "allow": True, "exp": int(time.time()) + 60},
+        )
+        result = await client.validate_decision_token_local(token)
+        assert result.decision_id == "dec_local"
+        assert result.allow is True
+        # Only the JWKS fetch went over the network
+        assert mock_session.get.call_args[1]["url"] == "https://api.aport.io/jwks.json"
+
+        expired = make_signed_token(
+            private_key,
+            {"decision_id": "dec_old", "allow": True, "exp": int(time.time()) - 1},
+        )
+        with pytest.raises(AportError) as exc_info:
+            await client.validate_decision_token_local(expired)
+        assert exc_info.value.reasons[0]["code"] == "INVALID_TOKEN"
+
+        tampered = token.rsplit(".", 1)[0] + "." + expired.rsplit(".", 1)[1]
+        with pytest.raises(AportError):
+            await client.validate_decision_token_local(tampered)
+        assert mock_session.get.call_count == 1
+        mock_session.post.assert_not_called()
+
+        no_exp = make_signed_token(private_key, {"decision_id": "dec_forever", "allow": True})
+        with pytest.raises(AportError) as exc_info:
+            await client.validate_decision_token_local(no_exp)
+        assert exc_info.value.reasons[0]["code"] == "INVALID_TOKEN"
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refresh_is_rate_limited(self):
+        """Test tokens with unknown kids refetch JWKS at most once per cooldown."""
+        rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        mock_session = create_mock_session(jwks_for(private_key))
+
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+        claims = {"decision_id": "dec_x", "allow": True, "exp": int(time.time()) + 60}
+
+        for i in range(5):
+            with pytest.raises(AportError):
+                await client.validate_decision_token_local(make_signed_token(private_key, claims, kid=f"rogue-{i}"))
+        assert mock_session.get.call_count == 1
+
+        # Past the cooldown an unknown kid triggers one refresh
+        client._jwks_fetched_at -= 3600
+        with pytest.raises(AportError):
+            await client.validate_decision_token_local(make_signed_token(private_key, claims, kid="rotated"))
+        assert mock_session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_malformed_jwks_falls_back_to_server(self):
+        """Test an unusable JWKS key falls back to server validation instead of leaking ValueError."""
+        pytest.importorskip("cryptography")
+        mock_session = create_mock_session({"keys": [{"kty": "RSA", "kid": "bad", "n": "", "e": "AQAB"}]})
+
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+        server_result = PolicyVerificationResponse(decision_id="dec_server", allow=True)
+        client.validate_decision_token = AsyncMock(return_value=server_result)
+
+        assert await client.validate_decision_token_local("a.b.c") is server_result
+        client.validate_decision_token.assert_awaited_once_with("a.b.c")
+
+    def test_jwks_from_minimal_keys(self):
+        """Test a JWKS with only the required members (no use/x5t/x5c) parses."""
+        jwks = Jwks.from_api_response({"keys": [{"kty": "RSA", "kid": "k1", "alg": "RS256", "n": "AQAB", "e": "AQAB"}]})
+
+        assert jwks.keys[0].kid == "k1"
+        assert jwks.keys[0].use is None
+        assert jwks.keys[0].x5t is None
+        assert jwks.keys[0].x5c == []
+
+    def test_from_api_response_unwraps_decision(self):
+        """Test the inner decision is used, unknown keys dropped, and outer _meta kept."""
+        data = {
+            "decision": {"decision_id": "dec_1", "allow": False, "reasons": [], "extra": 1},
+            "_meta": {"serverTiming": "db;dur=3"},
+        }
+        result = PolicyVerificationResponse.from_api_response(data)
+
+        assert result.decision_id == "dec_1"
+        assert result.allow is False
+        assert result._meta == {"serverTiming": "db;dur=3"}
+        assert "_meta" not in data["decision"]
+        assert not hasattr(result, "__dict__")
+
+    @pytest.mark.asyncio
+    async def test_get_passport_view_caps_streamed_size(self):
+        """Test streamed responses are rejected once they exceed the size cap."""
+        mock_session = create_mock_session({"agent_id": "test-agent", "limits": "x" * 100})
+        response = mock_session.get.return_value.response
+        response.content_length = None  # e.g. chunked transfer encoding
+
+        client = APortClient(self.options)
+        client._ensure_session = AsyncMock()
+        client._session = mock_session
+
+        with patch("aporthq_sdk_python.client._STREAM_CHUNK_SIZE", 16), patch(
+            "aporthq_sdk_python.client._MAX_STREAMED_RESPONSE_BYTES", 64
+        ):
+            with pytest.raises(AportError) as exc_info:
+                await client.get_passport_view("test-agent")
+
+        assert exc_info.value.reasons[0]["code"] == "RESPONSE_TOO_LARGE"
+        response.read.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_httpx_transport(self):
+        """Test the opt-in HTTP/2 transport sends the same requests and maps errors."""
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            if request.url.path.endswith("/verify_view"):
+                return httpx.Response(404, json={"reasons": [{"code": "NOT_FOUND", "message": "missing"}]})
+            return httpx.Response(
+                200, json={"decision_id": "dec_h2", "allow": True}, headers={"server-timing": "db;dur=1"}
+            )
+
+        client = APortClient(
+            APortClientOptions(base_url="https://api.aport.io", api_key="test-api-key", transport="httpx")
+        )
+        client._http2._new_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            result = await client.verify_policy("test-agent", "finance.payment.refund.v1", {"amount": 1}, "idem")
+            assert result.decision_id == "dec_h2"
+            assert result._meta == {"serverTiming": "db;dur=1"}
+            assert seen[0].method == "POST"
+            assert str(seen[0].url) == "https://api.aport.io/api/verify/policy/finance.payment.refund.v1"
+            assert seen[0].headers["Authorization"] == "Bearer test-api-key"
+            assert seen[0].headers["Idempotency-Key"] == "idem"
+            assert json.loads(seen[0].content)["context"]["amount"] == 1
+
+            with pytest.raises(AportError) as exc_info:
+                await client.get_passport_view("test-agent")
+            assert exc_info.value.status == 404
+            assert seen[1].method == "GET"
+            assert client._session is None
+        finally:
+            await client.close()
+
+        # Like the aiohttp path, a closed client reconnects on the next call; entering it
+        # as a context manager does not create an aiohttp session
+        async with client:
+            result = await client.verify_policy("test-agent", "finance.payment.refund.v1", {})
+            assert result.decision_id == "dec_h2"
+        assert client._session is None
+        assert client._http2._client.is_closed
+
+    def test_unknown_transport(self):
+        """Test an unsupported transport name is rejected."""
+        with pytest.raises(ValueError):
+            APortClientOptions(transport="urllib")
+
     @pytest.mark.asyncio
     async def test_normalize_url(self):
         """Test URL normalization."""
@@ -249,6 +581,63 @@ class TestAPortClient:
         assert client._normalize_url("/api/test") == "https://api.aport.io/api/test"
         assert client_with_slash._normalize_url("/api/test") == "https://api.aport.io/api/test"
         assert client._normalize_url("api/test") == "https://api.aport.io/api/test"
+        assert client._get_headers() == {"Authorization": "Bearer test-api-key"}
+        assert client_with_slash._get_headers("idem") == {"Idempotency-Key": "idem"}
+        # The no-key headers are shared, and adding a key never leaks into them
+        assert client._get_headers() is client._get_headers()
+        assert client._get_headers("idem")["Idempotency-Key"] == "idem"
+        assert "Idempotency-Key" not in client._get_headers()
+
+    @pytest.mark.asyncio
+    async def test_shared_client_pools_connections(self):
+        """Test shared() returns one client per configuration with a pooled connector."""
+        client = APortClient.shared(self.options)
+        try:
+            assert APortClient.shared(self.options) is client
+            assert APortClient.shared(APortClientOptions(base_url="https://sandbox.aport.io")) is not client
+
+            await client._ensure_session()
+            connector = client._session.connector
+            assert isinstance(connector, aiohttp.TCPConnector)
+            assert connector.limit == 100
+            assert connector.limit_per_host == 32
+        finally:
+            await client.close()
+            APortClient._shared_clients.clear()
+
+    def test_shared_client_per_event_loop(self):
+        """Test shared() survives a second asyncio.run: each loop gets its own client and session."""
+        import socket
+        from aiohttp import web
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        options = APortClientOptions(base_url=f"http://127.0.0.1:{port}", api_key="test-api-key")
+
+        async def verify(request):
+            return web.json_response({"decision_id": "dec_loop", "allow": True})
+
+        async def run_once():
+            app = web.Application()
+            app.router.add_post("/api/verify/policy/{pack_id}", verify)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, "127.0.0.1", port, reuse_address=True).start()
+            try:
+                client = APortClient.shared(options)
+                result = await client.verify_policy("test-agent", "finance.payment.refund.v1", {})
+                assert result.decision_id == "dec_loop"
+                return client
+            finally:
+                await runner.cleanup()
+
+        try:
+            first = asyncio.run(run_once())
+            second = asyncio.run(run_once())
+            assert second is not first
+        finally:
+            APortClient._shared_clients.clear()
 
     @pytest.mark.asyncio
     async def test_timeout_error(self):
@@ -265,7 +654,7 @@ class TestAPortClient:
             async def __aexit__(self, exc_type, exc_val, exc_tb):
                 pass
         
-        mock_session.request = Mock(return_value=MockRequestContextWithTimeout())
+        mock_session.post = Mock(return_value=MockRequestContextWithTimeout())
 
         with patch("aiohttp.ClientSession", return_value=mock_session):
             client = APortClient(self.options)
@@ -293,7 +682,7 @@ class TestAPortClient:
             async def __aexit__(self, exc_type, exc_val, exc_tb):
                 pass
         
-        mock_session.request = Mock(return_value=MockRequestContextWithError())
+        mock_session.post = Mock(return_value=MockRequestContextWithError())
 
         with patch("aiohttp.ClientSession", return_value=mock_session):
             client = APortClient(self.options)
@@ -347,6 +736,20 @@ class TestPolicyVerifier:
             assert result.decision_id == "dec_123"
             assert result.allow is True
 
+            # Same request verify_policy would send, without mutating the caller's context
+            call_args = mock_session.post.call_args
+            assert call_args[1]["url"] == "https://api.aport.io/api/verify/policy/finance.payment.refund.v1"
+            assert call_args[1]["headers"]["Idempotency-Key"] == "idem_123"
+            assert json.loads(call_args[1]["data"]) == {
+                "context": {
+                    **context,
+                    "agent_id": "test-agent",
+                    "policy_id": "finance.payment.refund.v1",
+                    "idempotency_key": "idem_123",
+                }
+            }
+            assert "agent_id" not in context
+
     @pytest.mark.asyncio
     async def test_verify_repository(self):
         """Test repository policy verification."""
@@ -374,4 +777,31 @@ class TestPolicyVerifier:
             result = await verifier.verify_repository("test-agent", context)
 
             assert result.decision_id == "dec_repo"
-            assert result.allow is True
\ No newline at end of file
+            assert result.allow is True
+
+    @pytest.mark.asyncio
+    async def test_verify_many(self):
+        """Test concurrent verification keeps spec order and isolates failures."""
+        client = APortClient(self.options)
+
+        async def fake_verify(agent_id, policy_id, context):
+            if policy_id == "data.export.create.v1":
+                raise AportError(403, [{"code": "DENIED", "message": "denied"}])
+            return PolicyVerificationResponse(decision_id=f"dec_{policy_id}", allow=True)
+
+        client.verify_policy = fake_verify
+        verifier = PolicyVerifier(client)
+
+        results = await verifier.verify_many(
+            "test-agent",
+            [
+                ("finance.payment.refund.v1", {"amount": 100}),
+                ("data.export.create.v1", {"rows": 10}),
+                ("messaging.message.send.v1", {"channel": "general"}),
+            ],
+            concurrency=2,
+        )
+
+        assert results[0].decision_id == "dec_finance.payment.refund.v1"
+        assert isinstance(results[1], AportError)
+        assert results[2].decision_id == "dec_messaging.message.send.v1"